@@ -0,0 +1,133 @@
+# benchmarks/clients.py
+# 벤치마크/재현 도구용 HTTP 클라이언트 (외부 의존성 없음)
+#  - InProcessClient: ASGI 앱을 같은 프로세스에서 직접 호출 (네트워크/서버 비용 제외)
+#  - HttpClient: 로컬 uvicorn 등 실제 서버에 keep-alive 연결로 요청
+import asyncio
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self.app = app
+        self._lifespan_task = None
+        self._lifespan_queue = None
+
+    async def start(self):
+        # 앱의 lifespan(startup)을 실행해 픽스처 로딩 등을 마친다
+        self._lifespan_queue = asyncio.Queue()
+        started = asyncio.get_running_loop().create_future()
+
+        async def receive():
+            return await self._lifespan_queue.get()
+
+        async def send(message):
+            if message["type"].startswith("lifespan.startup") and not started.done():
+                started.set_result(message)
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(self.app(scope, receive, send))
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        message = await started
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"Lifespan startup failed: {message}")
+
+    async def close(self):
+        if self._lifespan_task is not None:
+            await self._lifespan_queue.put({"type": "lifespan.shutdown"})
+            await self._lifespan_task
+            self._lifespan_task = None
+
+    async def post(self, path, body, content_type, headers=()):
+        request_headers = [
+            (b"host", b"testserver"),
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ] + [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": request_headers,
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+            "state": {},
+        }
+        body_sent = False
+        disconnected = asyncio.Event()
+        status = 0
+        chunks = []
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnected.set()
+        return status, b"".join(chunks)
+
+
+class HttpClient:
+    # 스레드마다 keep-alive 연결 하나를 유지한다
+    def __init__(self, base_url, concurrency=16, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def post(self, path, body, content_type, headers=()):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._post, path, body, content_type, headers)
+
+    def _post(self, path, body, content_type, headers):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        request_headers = {"Content-Type": content_type, **dict(headers)}
+        try:
+            conn.request("POST", path, body=body, headers=request_headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            # 끊어진 연결은 버리고 다음 요청에서 새로 연결
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+def make_client(target, concurrency):
+    # target이 http:// 이면 실제 서버, 아니면 main.app을 같은 프로세스에서 호출
+    if target.startswith("http://"):
+        return HttpClient(target, concurrency)
+    import main
+    return InProcessClient(main.app)
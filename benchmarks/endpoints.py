@@ -0,0 +1,271 @@
+# benchmarks/endpoints.py
+# main.py의 모든 엔드포인트에 대한 부하/지연시간 벤치마크
+#
+#   python -m benchmarks.endpoints                               # 같은 프로세스에서 실행
+#   python -m benchmarks.endpoints --target http://127.0.0.1:8000 # 실행 중인 uvicorn 대상
+#   python -m benchmarks.endpoints --concurrency 32 --batch 1000 --requests 500 \
+#       --output result.json --baseline baseline.json
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+from benchmarks.clients import make_client
+
+BID = "EV"
+BKEY = "1234567890123456"
+SPID = "KEC"
+
+FORM = "application/x-www-form-urlencoded"
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+
+# 실행마다 seq를 seed * SEQ_STRIDE부터 쓴다. 같은 서버(--target)에 여러 번 실행해도 등록 키가 겹치지 않도록.
+# seed는 0 ~ MAX_SEED-1 (대량 등록 시나리오가 쓰는 seq + 1000000 구간과 겹치지 않는 범위)
+SEQ_STRIDE = 10000
+MAX_SEED = 100
+
+
+def form(**fields):
+    messages = json.dumps({"bid": BID, "bkey": BKEY, **fields}, ensure_ascii=False)
+    return urlencode({"messages": messages}).encode("ascii"), FORM
+
+
+def body(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8"), JSON
+
+
+def ndjson(items):
+    return "\n".join(json.dumps(item, ensure_ascii=False) for item in items).encode("utf-8"), NDJSON
+
+
+def card_no(n):
+    return f"{1010010000000000 + n:016d}"
+
+
+def tsdt(n):
+    # 요청마다 다른 충전 시작시각 (중복 검사에 걸리지 않도록)
+    day, sec = divmod(n, 86400)
+    return f"202409{1 + day % 28:02d}{sec // 3600:02d}{sec // 60 % 60:02d}{sec % 60:02d}"
+
+
+def trade(seq, i, batch):
+    n = seq * batch + i
+    return {
+        "no": card_no(n % 1000000), "sid": f"{310000 + n % 5000:06d}", "cid": f"{n % 20 + 1:02d}",
+        "tbid": "EV", "tsdt": tsdt(n), "tedt": tsdt(n + 1800), "btid": "",
+        "pow": 5000 + n % 50000, "mon": 1825 + n % 20000, "bprice": 365.0, "tbprice": 365.0, "bmon": 1825,
+    }
+
+
+def use(seq, i, batch):
+    item = trade(seq, i, batch)
+    del item["no"], item["btid"], item["bprice"], item["tbprice"], item["bmon"]
+    return item
+
+
+def station(seq, i, batch):
+    n = seq * batch + i
+    return {
+        "spid": SPID, "csnm": f"벤치마크 충전소 {n}", "daddr": "서울특별시 중구 세종대로 110",
+        "lat": f"{37.4 + n % 1000 / 2500:.6f}", "longi": f"{126.8 + n % 1000 / 2000:.6f}",
+        "use_time": "24시간", "show_yn": "Y", "spcsid": f"CS{n:08d}", "park_fee_yn": "N", "park_fee": "",
+        "spcall": "1661-0000", "member_yn": "N", "open_yn": "Y", "use_yn": "Y", "postcd": "04524",
+        "cs_div": "01", "sido": "11", "sigungu": "11140", "oper_st_ymd": "20240101",
+        "oper_end_ymd": "99991231", "me_cs_id": f"{310000 + n % 5000:06d}",
+    }
+
+
+def charger(seq, i, batch):
+    n = seq * batch + i
+    return {
+        "spid": SPID, "csid": f"{SPID}S{n % 5000:06d}", "cpid": "", "cpnm": f"{n % 20 + 1}번 충전기",
+        "use_time": "24시간", "open_yn": "Y", "show_yn": "Y", "spcsid": f"CS{n % 5000:08d}",
+        "spcpid": f"CP{n:08d}", "charge_ucost1": "324.4", "use_yn": "Y", "oper_st_ymd": "20240101",
+        "oper_end_ymd": "99991231", "outlet_cnt": "1", "cpkw": "100", "charge_div": "2", "cp_div": "01",
+        "postcd": "04524", "cs_div": "01", "outlet_div": "01", "conn_div": "04", "charge_kw": "100",
+        "service_div": "1", "net_div": "1", "auth_div": "1", "compty_div": "01",
+        "me_cs_id": f"{310000 + n % 5000:06d}", "me_cp_id": f"{n % 20 + 1:02d}",
+    }
+
+
+def cp_status(seq, i, batch):
+    n = seq * batch + i
+    return {
+        "spid": SPID, "csid": f"{SPID}S{n % 5000:06d}", "cpid": f"{SPID}E{n % 100000:06d}",
+        "spcsid": f"CS{n % 5000:08d}", "spcpid": f"CP{n % 100000:08d}",
+        "cp_stat": str(n % 7), "update_time": datetime.now().strftime('%Y%m%d%H%M%S'),
+    }
+
+
+# (이름, 경로, 요청 본문 생성 함수(seq, batch) -> (bytes, content-type))
+SCENARIOS = [
+    ("code_list", "/r2/code/list", lambda seq, batch: form()),
+    ("code_lookup", "/r2/code/list", lambda seq, batch: form(id="BID", code="AC")),
+    ("card_update", "/r2/card/update", lambda seq, batch: form(card=[
+        {"no": card_no(seq * batch + i), "stop": "YN"[(seq + i) % 2]} for i in range(batch)])),
+    ("card_list", "/r2/card/list", lambda seq, batch: form(kind="1")),
+    ("trade_regi", "/r2/trade/regi", lambda seq, batch: form(trade=[trade(seq, i, batch) for i in range(batch)])),
+    ("use_regi", "/r2/use/regi", lambda seq, batch: form(use=[use(seq, i, batch) for i in range(batch)])),
+    # 대량 등록은 일반 등록과 키가 겹치지 않도록 seq를 띄워서 생성
+    ("trade_regi_bulk", f"/r2/trade/regi/bulk?bid={BID}&bkey={BKEY}", lambda seq, batch: ndjson(
+        trade(seq + 1000000, i, batch) for i in range(batch))),
+    ("use_regi_bulk", f"/r2/use/regi/bulk?bid={BID}&bkey={BKEY}", lambda seq, batch: ndjson(
+        use(seq + 1000000, i, batch) for i in range(batch))),
+    ("trade_listall", "/r2/trade/listall", lambda seq, batch: form(kind="1", pageno=1, pagesize=batch)),
+    ("trade_query", "/r2/trade/listall", lambda seq, batch: form(
+        kind="1", sdate="20240917000000", edate="20240917235959", pageno=1, pagesize=batch)),
+    ("trade_stat", "/r2/trade/stat", lambda seq, batch: form(group=("sid", "cid", "bid")[seq % 3])),
+    ("charger_info_list", "/r2/charger/info/list", lambda seq, batch: form(kind="1")),
+    ("charger_status_update", "/r2/charger/status/update", lambda seq, batch: form(cstat=[
+        {"sid": f"{310000 + i % 5000:06d}", "cid": f"{i % 20 + 1:02d}", "status": str((seq + i) % 7)}
+        for i in range(batch)])),
+    ("charger_status_list", "/r2/charger/status/list", lambda seq, batch: form(kind="1")),
+    ("charger_info_listall", "/r2/charger/info/listall", lambda seq, batch: form(kind="1", pageno=1, pagesize=batch)),
+    ("trade_list", "/r2/trade/list", lambda seq, batch: form(kind="1")),
+    ("charger_qr", "/p1/charger/qr", lambda seq, batch: form(pageno=1, pagesize=batch)),
+    ("cs_update", f"/evapi/v200/{SPID}/cs/update", lambda seq, batch: body({
+        "spkey": BKEY, "list": [station(seq, i, batch) for i in range(batch)]})),
+    ("cs_search", f"/evapi/v200/{SPID}/cs/search", lambda seq, batch: body(
+        {"lat": 37.5, "longi": 126.925, "radius": 1 + seq % 5, "open_yn": "Y"})),
+    ("cp_update", f"/evapi/v200/{SPID}/cp/update", lambda seq, batch: body({
+        "spkey": BKEY, "list": [charger(seq, i, batch) for i in range(batch)]})),
+    ("cp_status_update", f"/evapi/v200/{SPID}/cp/status/update", lambda seq, batch: body({
+        "spkey": BKEY, "list": [cp_status(seq, i, batch) for i in range(batch)]})),
+    ("uid_update", f"/evapi/v200/{SPID}/uid/update", lambda seq, batch: body({
+        "spkey": BKEY, "list": [{"spid": SPID, "cardno": card_no(seq * batch + i), "stop_yn": "N"}
+                                for i in range(batch)]})),
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, path, build, requests, concurrency, batch, first_seq=0):
+    # 요청 본문은 측정 전에 미리 만들어 둔다
+    payloads = [build(first_seq + seq, batch) for seq in range(requests)]
+    latencies = []
+    statuses = {}
+    errors = 0
+    next_seq = 0
+
+    async def worker():
+        nonlocal next_seq, errors
+        while next_seq < requests:
+            data, content_type = payloads[next_seq]
+            next_seq += 1
+            start = time.perf_counter()
+            try:
+                status, _ = await client.post(path, data, content_type)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": requests,
+        "errors": errors,
+        "status": statuses,
+        "elapsed_s": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def compare(results, baseline, max_regression):
+    # 기준 결과 대비 p95 증가율을 비교, 허용치를 넘은 엔드포인트 목록 반환
+    regressions = []
+    print(f"\n{'endpoint':24s} {'p95 base':>10s} {'p95 now':>10s} {'diff':>8s} {'rps diff':>9s}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["p95_ms"]:
+            continue
+        diff = (result["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+        rps_diff = (result["rps"] - base["rps"]) / base["rps"] * 100 if base["rps"] else 0.0
+        flag = ""
+        if max_regression is not None and diff > max_regression:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:24s} {base['p95_ms']:10.2f} {result['p95_ms']:10.2f} {diff:+7.1f}% {rps_diff:+8.1f}%{flag}")
+    return regressions
+
+
+async def run(args):
+    scenarios = [s for s in SCENARIOS if not args.only or any(key in s[0] for key in args.only)]
+    client = make_client(args.target, args.concurrency)
+    await client.start()
+    results = {}
+    # 워밍업은 측정 구간 뒤의 seq를 써서, 측정 요청이 워밍업과 같은 키(중복 처리 경로)가 되지 않게 한다
+    first_seq = args.seed * SEQ_STRIDE
+    print(f"seed {args.seed}")
+    try:
+        for name, path, build in scenarios:
+            if args.warmup:
+                await run_scenario(client, path, build, args.warmup, args.concurrency, args.batch,
+                                   first_seq + args.requests)
+            result = await run_scenario(client, path, build, args.requests, args.concurrency, args.batch, first_seq)
+            results[name] = result
+            print(f"{name:24s} {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  "
+                  f"p99 {result['p99_ms']:8.2f} ms  status {result['status']}  errors {result['errors']}")
+    finally:
+        await client.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KECO mock API load test")
+    parser.add_argument("--target", default="inprocess", help='"inprocess" 또는 http://host:port')
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=100, help="배치/페이지 크기")
+    parser.add_argument("--seed", type=int, choices=range(MAX_SEED), default=random.randrange(MAX_SEED),
+                        metavar=f"0..{MAX_SEED - 1}",
+                        help="등록 키 생성 seed (기본: 임의). 요청 수 + 워밍업이 SEQ_STRIDE 이하일 때 실행 간 키가 겹치지 않음")
+    parser.add_argument("--only", nargs="*", help="이름에 포함된 시나리오만 실행 (예: trade card)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, help="p95 허용 증가율(%%). 넘으면 종료코드 1")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        report = {
+            "meta": {
+                "target": args.target, "concurrency": args.concurrency, "requests": args.requests,
+                "batch": args.batch, "seed": args.seed, "created": datetime.now().strftime('%Y%m%d%H%M%S'),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/replay.py
+# KECO_CAPTURE=1 로 캡처한 요청(JSON Lines)을 다시 보내고, 캡처 당시 대비 지연시간 변화를 보고한다
+#
+#   python -m benchmarks.replay requests.jsonl                      # 원래 간격대로 (같은 프로세스)
+#   python -m benchmarks.replay requests.jsonl --speed 10           # 10배 빠르게
+#   python -m benchmarks.replay requests.jsonl --speed 0 --target http://127.0.0.1:8000  # 간격 없이 최대 속도
+import argparse
+import asyncio
+import base64
+import json
+import time
+from urllib.parse import urlencode
+
+from benchmarks.clients import make_client
+from benchmarks.endpoints import percentile
+
+
+def load_records(path, limit=None):
+    records = []
+    truncated = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "path" not in record or record.get("method", "POST") != "POST":
+                continue
+            if record.get("body_truncated"):
+                # 본문을 저장하지 않은 큰 요청(KECO_CAPTURE_MAX_BODY 초과)은 재현할 수 없다
+                truncated += 1
+                continue
+            records.append(record)
+            if limit and len(records) >= limit:
+                break
+    if truncated:
+        print(f"{truncated} captured requests skipped (body not captured)")
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+def request_body(record):
+    # (본문, content-type, 추가 헤더)
+    content_type = record.get("content_type") or "application/x-www-form-urlencoded"
+    headers = [("Content-Encoding", record["content_encoding"])] if record.get("content_encoding") else []
+    if "body_b64" in record:
+        return base64.b64decode(record["body_b64"]), content_type, headers
+    if "messages" in record:
+        return urlencode({"messages": record["messages"]}).encode("ascii"), content_type, headers
+    if "json" in record:
+        return json.dumps(record["json"], ensure_ascii=False).encode("utf-8"), content_type, headers
+    return record.get("body", "").encode("utf-8"), content_type, headers
+
+
+async def replay(client, records, speed, concurrency):
+    # 캡처 시각 간격을 speed 배로 줄여 요청을 보낸다 (speed 0이면 간격 없이 전송)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+    first_ts = records[0]["ts"]
+    started = time.perf_counter()
+
+    async def send(record):
+        data, content_type, headers = request_body(record)
+        path = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                status, _ = await client.post(path, data, content_type, headers)
+            except Exception:
+                status = 0
+            results.append((record, status, (time.perf_counter() - start) * 1000))
+
+    tasks = []
+    for record in records:
+        if speed > 0:
+            delay = (record["ts"] - first_ts) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(record)))
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - started
+
+
+def report(results, elapsed):
+    by_path = {}
+    for record, status, latency in results:
+        by_path.setdefault(record["path"], []).append((record, status, latency))
+
+    summary = {}
+    print(f"{'path':40s} {'count':>6s} {'cap p50':>9s} {'now p50':>9s} {'cap p95':>9s} {'now p95':>9s} "
+          f"{'drift p95':>10s} {'status diff':>11s}")
+    for path, rows in sorted(by_path.items()):
+        captured = sorted(record.get("elapsed_ms", 0.0) for record, _, _ in rows)
+        replayed = sorted(latency for _, _, latency in rows)
+        mismatched = sum(1 for record, status, _ in rows if status != record.get("status"))
+        cap_p95, now_p95 = percentile(captured, 95), percentile(replayed, 95)
+        drift = (now_p95 - cap_p95) / cap_p95 * 100 if cap_p95 else 0.0
+        summary[path] = {
+            "count": len(rows), "status_mismatch": mismatched,
+            "captured_p50_ms": percentile(captured, 50), "replay_p50_ms": percentile(replayed, 50),
+            "captured_p95_ms": cap_p95, "replay_p95_ms": now_p95, "drift_p95_pct": drift,
+        }
+        print(f"{path:40s} {len(rows):6d} {percentile(captured, 50):9.2f} {percentile(replayed, 50):9.2f} "
+              f"{cap_p95:9.2f} {now_p95:9.2f} {drift:+9.1f}% {mismatched:11d}")
+    print(f"\n{len(results)} requests replayed in {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s)")
+    return summary
+
+
+async def run(args):
+    records = load_records(args.capture, args.limit)
+    if not records:
+        print("No captured requests.")
+        return {}
+    client = make_client(args.target, args.concurrency)
+    await client.start()
+    try:
+        results, elapsed = await replay(client, records, args.speed, args.concurrency)
+    finally:
+        await client.close()
+    return report(results, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured KECO mock API traffic")
+    parser.add_argument("capture", nargs="?", default="requests.jsonl")
+    parser.add_argument("--target", default="inprocess", help='"inprocess" 또는 http://host:port')
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1=원래 간격, 0=간격 없이)")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시에 처리 중인 최대 요청 수")
+    parser.add_argument("--limit", type=int, help="앞에서부터 재생할 요청 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/serialization.py
+# 응답 직렬화 비용 비교: 표준 json(JSONResponse 방식) vs orjson vs 현재 사용 중인 encode_json
+#
+#   python -m benchmarks.serialization [--file trade_list_kind1_response.json] [--repeat 50]
+import argparse
+import json
+import statistics
+import time
+
+from responses import encode_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def stdlib_dumps(content):
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def measure(fn, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", nargs="*", default=["trade_list_kind1_response.json", "data.json"])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    cases = [("stdlib json", stdlib_dumps), ("encode_json", encode_json)]
+    if orjson is not None:
+        cases.insert(1, ("orjson", lambda content: orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)))
+    else:
+        print("orjson not installed: encode_json falls back to stdlib json")
+
+    for file_name in args.file:
+        with open(file_name, encoding="utf-8") as f:
+            content = json.load(f)
+        size = len(stdlib_dumps(content))
+        baseline = None
+        print(f"\n{file_name} ({size} bytes)")
+        for name, fn in cases:
+            fn(content)
+            median = measure(fn, content, args.repeat)
+            baseline = baseline or median
+            print(f"  {name:12s} {median * 1000:8.3f} ms  x{baseline / median:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
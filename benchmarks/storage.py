@@ -0,0 +1,87 @@
+# benchmarks/storage.py
+# 등록 배치 처리 비용 비교: 메모리 저장소만(기본) vs 메모리 + SQLite(WAL) 기록, 재시작 시 재적재 시간
+#
+#   python -m benchmarks.storage [--batches 50] [--batch 1000] [--path bench.db]
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.endpoints import SPID, card_no, station, trade
+from card_store import CardStore
+from models import CardUpdate, ChargingStationUpdate, Trade
+from station_store import StationStore
+from storage import SqliteStorage
+from trade_store import TradeStore
+
+
+def run(name, batches, apply):
+    timings = []
+    rows = 0
+    for seq, items in enumerate(batches):
+        start = time.perf_counter()
+        apply(seq, items)
+        timings.append(time.perf_counter() - start)
+        rows += len(items)
+    total = sum(timings)
+    print(f"  {name:28s} {rows / total:10.0f} rows/s  p50 {statistics.median(timings) * 1000:7.2f} ms/batch")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--path", help="SQLite 파일 경로 (기본: 임시 파일)")
+    args = parser.parse_args()
+
+    # 검증 비용은 빼고 저장 비용만 비교하도록 모델은 미리 만들어 둔다
+    trades = [[Trade.model_validate(trade(seq, i, args.batch)) for i in range(args.batch)]
+              for seq in range(args.batches)]
+    cards = [[CardUpdate(no=card_no(seq * args.batch + i), stop="N") for i in range(args.batch)]
+             for seq in range(args.batches)]
+    stations = [[{**ChargingStationUpdate.model_validate(station(seq, i, args.batch)).model_dump(),
+                  "csid": f"{SPID}S{seq * args.batch + i:06d}"} for i in range(args.batch)]
+                for seq in range(args.batches)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or os.path.join(tmp, "bench.db")
+        for backend in ("memory", "sqlite"):
+            storage = None
+            if backend == "sqlite":
+                storage = SqliteStorage(path)
+                storage.open()
+            trade_store, card_store, station_store = TradeStore(), CardStore(), StationStore()
+            print(f"\n{backend} ({args.batches} batches x {args.batch} rows)")
+
+            def save_trades(seq, items):
+                start = len(trade_store)
+                trade_store.insert("EV", items, "20240917000000")
+                if storage:
+                    storage.save_trades(trade_store[start:])
+
+            def save_cards(seq, items):
+                card_store.update("EV", items, "20240917000000")
+                if storage:
+                    storage.save_cards(card_store.get(item.no) for item in items)
+
+            def save_stations(seq, items):
+                for item in items:
+                    station_store.put(item)
+                if storage:
+                    storage.save_stations(items)
+
+            run("trade regi", trades, save_trades)
+            run("card update", cards, save_cards)
+            run("cs update", stations, save_stations)
+
+            if storage:
+                start = time.perf_counter()
+                restored = TradeStore()
+                restored.load(storage.load_trades())
+                print(f"  {'hydrate trades':28s} {len(restored):10d} rows    {time.perf_counter() - start:7.2f} s")
+                storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/trade_store.py
+# 충전이력 보관 메모리 비교: 행 dict 목록 vs TradeStore(컬럼 배열), 그룹별 집계 시간
+#
+#   python -m benchmarks.trade_store [--rows 200000]
+import argparse
+import json
+import time
+import tracemalloc
+
+import trade_stats
+from trade_store import TradeStore
+
+
+def synthetic_rows(base, count):
+    # 원본 행을 순환하면서 카드번호/일시/순번을 바꿔 서로 다른 이력으로 만든다
+    for i in range(count):
+        row = dict(base[i % len(base)])
+        row["no"] = f"{1010010000000000 + i:016d}"
+        row["tsdt"] = f"{20240101000000 + i:014d}"
+        row["btid"] = row["btid"] and f"{row['btid']}{i}"
+        row["tseq"] = str(i + 1)
+        yield row
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="trade_list_kind1_response.json")
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with open(args.file, encoding="utf-8") as f:
+        base = json.load(f)["trade"]
+
+    # 파일에서 읽은 행처럼 문자열 값을 새로 만들어 둔 dict 목록
+    def build_dicts():
+        return [json.loads(json.dumps(row)) for row in synthetic_rows(base, args.rows)]
+
+    def build_store():
+        store = TradeStore()
+        store.load(synthetic_rows(base, args.rows))
+        return store
+
+    print(f"{args.rows} trades")
+    for name, build in (("list[dict]", build_dicts), ("TradeStore", build_store)):
+        _, size, elapsed = measure(build)
+        print(f"  {name:12s} {size / 2 ** 20:9.1f} MiB  {size / args.rows:7.1f} B/row  load {elapsed:6.2f} s")
+
+    store = build_store()
+    start = time.perf_counter()
+    store[:5000]
+    print(f"  TradeStore   page of 5000 rows restored in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    engines = [("python", None)]
+    if trade_stats.np is not None:
+        engines.insert(0, ("numpy", trade_stats.np))
+    else:
+        print("  numpy not installed: aggregation uses the python fallback")
+    for engine, module in engines:
+        trade_stats.np = module
+        for group in trade_stats.GROUP_FIELDS:
+            start = time.perf_counter()
+            result = trade_stats.aggregate(store, group)
+            print(f"  aggregate by {group:4s} ({engine:6s}) {len(result):7d} groups in "
+                  f"{(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# benchmarks/validation.py
+# TradeRegiRequest(5,000건) 검증 비용 비교: 기존 @validator(파이썬 함수) 방식 vs pydantic-core 제약 타입
+#
+#   python -m benchmarks.validation [--items 5000] [--repeat 20]
+import argparse
+import json
+import statistics
+import time
+import warnings
+from typing import List
+
+from pydantic import BaseModel
+
+from models import TradeRegiRequest
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    from pydantic import validator
+
+    # 변경 전 models.py의 Trade/TradeRegiRequest 정의 (비교용)
+    class LegacyTrade(BaseModel):
+        no: str
+        sid: str
+        cid: str
+        tbid: str
+        tsdt: str
+        tedt: str
+        btid: str = None
+        pow: int
+        mon: int
+        bprice: float = None
+        tbprice: float = None
+        bmon: int = None
+
+        @validator('no')
+        def validate_no(cls, v):
+            if len(v) != 16 or not v.isdigit():
+                raise ValueError('회원카드는 16자리 숫자형식입니다.')
+            return v
+
+        @validator('sid')
+        def validate_sid(cls, v):
+            if len(v) != 6 or not v.isdigit():
+                raise ValueError('충전소ID는 6자리 숫자형식입니다.')
+            return v
+
+        @validator('cid')
+        def validate_cid(cls, v):
+            if len(v) != 2 or not v.isdigit():
+                raise ValueError('충전기ID는 2자리 숫자형식입니다.')
+            return v
+
+        @validator('tsdt', 'tedt')
+        def validate_datetime(cls, v):
+            if len(v) != 14 or not v.isdigit():
+                raise ValueError('날짜는 14자리 숫자형식이어야 합니다.')
+            return v
+
+    class LegacyTradeRegiRequest(BaseModel):
+        bid: str
+        bkey: str
+        trade: List[LegacyTrade]
+
+        @validator('bid')
+        def validate_bid(cls, v):
+            if len(v) != 2 or v not in ['EV', 'KP']:
+                raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
+            return v
+
+
+def make_payload(items):
+    trade = [
+        {
+            "no": f"{1010010000000000 + i:016d}",
+            "sid": f"{310000 + i % 1000:06d}",
+            "cid": f"{i % 100:02d}",
+            "tbid": "EV",
+            "tsdt": "20240917130047",
+            "tedt": "20240917153603",
+            "btid": "",
+            "pow": 5000,
+            "mon": 1825,
+            "bprice": 365.0,
+            "tbprice": 365.0,
+            "bmon": 1825,
+        }
+        for i in range(items)
+    ]
+    return {"bid": "EV", "bkey": "1234567890123456", "trade": trade}
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = make_payload(args.items)
+    cases = [
+        ("legacy @validator", lambda: LegacyTradeRegiRequest(**payload)),
+        ("constrained types", lambda: TradeRegiRequest(**payload)),
+    ]
+
+    results = {}
+    for name, fn in cases:
+        fn()
+        median, best = measure(fn, args.repeat)
+        results[name] = median
+        print(f"{name:20s} median {median * 1000:8.2f} ms  best {best * 1000:8.2f} ms  ({args.items} items)")
+
+    legacy, current = results["legacy @validator"], results["constrained types"]
+    print(json.dumps({"items": args.items, "legacy_ms": legacy * 1000, "constrained_ms": current * 1000,
+                      "speedup": legacy / current}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# bulk.py
+import zlib
+
+from pydantic import ValidationError
+
+from settings import BULK_CHUNK_ROWS, BULK_MAX_LINE
+
+# gzip 해제 시 한 번에 풀어내는 최대 크기 (압축률이 큰 본문도 메모리를 이 정도로 제한)
+INFLATE_CHUNK = 64 * 1024
+
+
+def _inflate(decoder, chunk):
+    data = decoder.decompress(chunk, INFLATE_CHUNK)
+    while True:
+        yield data
+        if not decoder.unconsumed_tail:
+            break
+        data = decoder.decompress(decoder.unconsumed_tail, INFLATE_CHUNK)
+
+
+class _LineSplitter:
+    # 본문 조각을 줄로 나눈다. 끝나지 않은 줄은 조각 목록으로 들고 있다가 줄이 끝날 때 한 번만 합치고,
+    # max_line 바이트를 넘는 줄은 더 모으지 않고 버린 뒤 None으로 알린다.
+    def __init__(self, max_line):
+        self.max_line = max_line
+        self._parts = []
+        self._size = 0
+        self._too_long = False
+
+    def feed(self, data):
+        lines = []
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                self._add(data[start:])
+                return lines
+            self._add(data[start:end])
+            lines.append(self.finish())
+            start = end + 1
+
+    def _add(self, piece):
+        if not piece or self._too_long:
+            return
+        self._size += len(piece)
+        if self._size > self.max_line:
+            self._too_long = True
+            self._parts = []
+        else:
+            self._parts.append(piece)
+
+    def finish(self):
+        line = None if self._too_long else b"".join(self._parts)
+        self._parts = []
+        self._size = 0
+        self._too_long = False
+        return line
+
+
+async def iter_lines(chunks, gzipped=False, max_line=BULK_MAX_LINE):
+    # 요청 본문 조각을 받는 대로 줄 단위로 나눈다. 메모리에는 아직 끝나지 않은 한 줄(max_line 이하)만 남는다.
+    # max_line을 넘는 줄은 None으로 내보낸다. gzip 본문이 끝(trailer)까지 오지 않으면 zlib.error.
+    decoder = zlib.decompressobj(wbits=31) if gzipped else None
+    splitter = _LineSplitter(max_line)
+    async for chunk in chunks:
+        for data in (_inflate(decoder, chunk) if decoder else (chunk,)):
+            for line in splitter.feed(data):
+                yield line
+    if decoder:
+        for line in splitter.feed(decoder.flush()):
+            yield line
+        if not decoder.eof:
+            raise zlib.error("incomplete gzip body (truncated)")
+    yield splitter.finish()
+
+
+def validation_errmsg(e):
+    messages = []
+    for err in e.errors():
+        loc = ".".join(str(loc) for loc in err["loc"])
+        messages.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return "; ".join(messages)
+
+
+def validate_items(model, items, key_fields=()):
+    # 목록 항목을 한 건씩 model로 검증해 (정상 항목 목록, errlist)를 반환.
+    # 오류 항목은 {"row": 순번(1부터), key_fields 값, "errcode": "300", "errmsg": ...}
+    valid = []
+    errors = []
+    for row, item in enumerate(items, 1):
+        try:
+            valid.append(model.model_validate(item))
+        except ValidationError as e:
+            error = {"row": row}
+            if isinstance(item, dict):
+                error.update({field: item[field] for field in key_fields if field in item})
+            error.update({"errcode": "300", "errmsg": validation_errmsg(e)})
+            errors.append(error)
+    return valid, errors
+
+
+async def read_batches(chunks, model, gzipped=False, batch_size=BULK_CHUNK_ROWS):
+    # NDJSON 본문을 한 줄씩 model로 검증해 batch_size 단위로 (항목 목록, 오류 목록)을 내보낸다.
+    # 오류 항목은 {"line": 줄 번호, "errmsg": ...}. 빈 줄은 건너뛴다.
+    items = []
+    errors = []
+    lineno = 0
+    async for line in iter_lines(chunks, gzipped):
+        lineno += 1
+        if line is None:
+            errors.append({"line": lineno, "errmsg": f"line too long (max {BULK_MAX_LINE} bytes)"})
+            continue
+        if not line.strip():
+            continue
+        try:
+            items.append(model.model_validate_json(line))
+        except ValidationError as e:
+            errors.append({"line": lineno, "errmsg": validation_errmsg(e)})
+        if len(items) + len(errors) >= batch_size:
+            yield items, errors
+            items = []
+            errors = []
+    if items or errors:
+        yield items, errors
@@ -0,0 +1,142 @@
+# capture.py
+import base64
+import json
+import logging
+import queue
+import threading
+import time
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureWriter:
+    # 캡처한 요청을 백그라운드 스레드에서 모아서 JSON Lines 파일에 추가한다.
+    # 요청 처리 쪽에서는 큐에 넣기만 하므로 파일 I/O나 본문 디코딩 비용이 없다.
+    def __init__(self, path, batch_size=200, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    def put(self, record):
+        self._queue.put(record)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            stopping = False
+            while not stopping:
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        stopping = True
+                        break
+                    batch.append(record)
+                if batch:
+                    try:
+                        f.write("".join(self._encode(record) for record in batch))
+                        f.flush()
+                    except Exception as e:
+                        logger.error(f"Capture write error: {str(e)}")
+
+    @staticmethod
+    def _encode(record):
+        body = record.pop("body")
+        content_type = record.get("content_type", "")
+        try:
+            if record.get("content_encoding") or record.get("body_truncated"):
+                # 압축 본문(gzip NDJSON 등)은 바이트 그대로 base64로 (잘린 본문은 재현하지 않으므로 비어 있음)
+                if body:
+                    record["body_b64"] = base64.b64encode(body).decode("ascii")
+            elif content_type.startswith("application/x-www-form-urlencoded"):
+                fields = parse_qs(body.decode("utf-8"), keep_blank_values=True)
+                record["messages"] = fields.get("messages", [""])[0]
+            elif content_type.startswith("application/json"):
+                record["json"] = json.loads(body) if body else None
+            elif body:
+                record["body"] = body.decode("utf-8")
+        except ValueError:
+            # UTF-8이 아닌 본문도 그대로 재현할 수 있게 base64로
+            record["body_b64"] = base64.b64encode(body).decode("ascii")
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class CaptureMiddleware:
+    # 요청 경로/본문/응답 상태/처리 시간을 CaptureWriter 큐로 넘기는 ASGI 미들웨어.
+    # 본문은 max_body 바이트까지만 모은다. 그보다 큰 본문(스트리밍 대량 등록 등)은 버리고 크기만 기록해
+    # 캡처 중에도 요청당 메모리가 제한된다 (잘린 요청은 재현 대상에서 빠진다).
+    def __init__(self, app, writer, max_body=1024 * 1024):
+        self.app = app
+        self.writer = writer
+        self.max_body = max_body
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.time()
+        start = time.perf_counter()
+        chunks = []
+        size = 0
+        status = 0
+
+        async def capture_receive():
+            nonlocal chunks, size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                size += len(body)
+                if chunks is not None:
+                    if size <= self.max_body:
+                        chunks.append(body)
+                    else:
+                        chunks = None
+            return message
+
+        async def capture_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                self._record(scope, started, time.perf_counter() - start, status, chunks, size)
+
+        await self.app(scope, capture_receive, capture_send)
+
+    def _record(self, scope, started, elapsed, status, chunks, size):
+        headers = dict(scope["headers"])
+        record = {
+            "ts": started,
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "content_type": headers.get(b"content-type", b"").decode("latin-1"),
+            "status": status,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "body": b"".join(chunks) if chunks is not None else b"",
+        }
+        content_encoding = headers.get(b"content-encoding", b"").decode("latin-1")
+        if content_encoding:
+            record["content_encoding"] = content_encoding
+        if chunks is None:
+            record["body_truncated"] = True
+            record["body_size"] = size
+        self.writer.put(record)
@@ -0,0 +1,69 @@
+# card_store.py
+from bisect import bisect_left, bisect_right
+
+
+class CardStore:
+    # 회원카드 번호(no)를 키로 하는 카드 저장소.
+    # upddate 순으로 정렬된 보조 인덱스(_upd_dates/_upd_nos)를 유지해 변경분 조회를 범위 스캔으로 처리한다.
+    def __init__(self):
+        self._cards = {}
+        self._upd_dates = []
+        self._upd_nos = []
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._cards)
+
+    def get(self, no):
+        return self._cards.get(no)
+
+    def load(self, cards):
+        for card in cards:
+            self._put(dict(card))
+
+    def update(self, bid, items, now):
+        # 반환값: (inscnt, updcnt, dupcnt). stop 값이 그대로인 카드는 중복(dupcnt)으로 본다.
+        inscnt = updcnt = dupcnt = 0
+        for item in items:
+            card = self._cards.get(item.no)
+            if card is None:
+                self._put({"bid": bid, "no": item.no, "stop": item.stop, "regdate": now, "upddate": now})
+                inscnt += 1
+            elif card["stop"] == item.stop:
+                dupcnt += 1
+            else:
+                self._put({**card, "stop": item.stop, "upddate": now})
+                updcnt += 1
+        return inscnt, updcnt, dupcnt
+
+    def list_since(self, upddate=""):
+        # upddate 이후(포함) 변경된 카드를 upddate 순으로 반환
+        start = bisect_left(self._upd_dates, upddate)
+        result = []
+        for i in range(start, len(self._upd_dates)):
+            card = self._cards[self._upd_nos[i]]
+            # 이후에 다시 갱신된 카드의 이전 인덱스 항목은 건너뛴다
+            if card["upddate"] == self._upd_dates[i]:
+                result.append(card)
+        return result
+
+    def _put(self, card):
+        old = self._cards.get(card["no"])
+        self._cards[card["no"]] = card
+        if old is not None:
+            if old["upddate"] == card["upddate"]:
+                return
+            self._stale += 1
+
+        pos = bisect_right(self._upd_dates, card["upddate"])
+        self._upd_dates.insert(pos, card["upddate"])
+        self._upd_nos.insert(pos, card["no"])
+
+        if self._stale > len(self._cards):
+            self._compact()
+
+    def _compact(self):
+        ordered = sorted(self._cards.values(), key=lambda card: card["upddate"])
+        self._upd_dates = [card["upddate"] for card in ordered]
+        self._upd_nos = [card["no"] for card in ordered]
+        self._stale = 0
@@ -0,0 +1,28 @@
+# code_table.py
+
+
+class CodeTable:
+    # 공통코드(ccode) 목록을 id별, (id, code)별로 색인해 두고 필터 조회를 O(1)로 처리한다.
+    # 색인은 원본 행을 그대로 가리키므로 추가 메모리는 dict 항목 정도다.
+    def __init__(self, rows):
+        self.rows = rows
+        self._by_id = {}
+        self._by_code = {}
+        self._by_id_code = {}
+        for row in rows:
+            self._by_id.setdefault(row.get("id"), []).append(row)
+            self._by_code.setdefault(row.get("code"), []).append(row)
+            self._by_id_code[(row.get("id"), row.get("code"))] = row
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, id=None, code=None):
+        if id is not None and code is not None:
+            row = self._by_id_code.get((id, code))
+            return [row] if row is not None else []
+        if id is not None:
+            return self._by_id.get(id, [])
+        if code is not None:
+            return self._by_code.get(code, [])
+        return self.rows
@@ -0,0 +1,58 @@
+# dedup.py
+from datetime import datetime, timedelta
+
+
+class DedupIndex:
+    # 자연키(예: no/sid/cid/tsdt)의 64비트 해시만 날짜(tsdt 앞 8자리)별 set에 보관하는 중복 검사 인덱스.
+    # 키 문자열 자체를 들고 있지 않아 건당 메모리가 작고, 조회/등록은 O(1)이다.
+    # window_days > 0 이면 가장 최근 날짜(오늘을 넘지 않게 제한) 기준으로 기간이 지난 날짜 버킷을 통째로 버리고,
+    # 기간 밖 날짜의 키는 보관하지 않는다 (항상 새 키로 본다).
+    def __init__(self, window_days=0):
+        self.window_days = window_days
+        self._buckets = {}
+        self._latest = ""
+        self._cutoff = ""
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def add(self, key, tsdt):
+        # 새 키면 True, 이미 등록된 키면 False.
+        # tsdt가 빈 값이면 자연키가 성립하지 않으므로(같은 충전기의 모든 건이 같은 키) 검사 없이 항상 True
+        if not tsdt:
+            return True
+        day = tsdt[:8]
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            if day < self._cutoff:
+                return True
+            bucket = self._buckets[day] = set()
+            if self.window_days > 0 and day > self._latest:
+                self._advance(day)
+
+        digest = hash(key)
+        if digest in bucket:
+            return False
+        bucket.add(digest)
+        return True
+
+    def discard(self, key, tsdt):
+        # add()로 등록했지만 저장하지 못한 키를 되돌린다
+        bucket = self._buckets.get(tsdt[:8])
+        if bucket is not None:
+            bucket.discard(hash(key))
+
+    def _advance(self, day):
+        # 미래 일자 한 건이 실제 버킷을 모두 밀어내지 않도록 기준일은 오늘로 제한하고,
+        # 날짜로 해석할 수 없는 값(예: 20241399)은 기준일로 쓰지 않는다
+        day = min(day, datetime.now().strftime('%Y%m%d'))
+        if day <= self._latest:
+            return
+        try:
+            latest = datetime.strptime(day, '%Y%m%d')
+        except ValueError:
+            return
+        self._latest = day
+        self._cutoff = (latest - timedelta(days=self.window_days)).strftime('%Y%m%d')
+        for old in [old for old in self._buckets if old < self._cutoff]:
+            del self._buckets[old]
@@ -0,0 +1,79 @@
+# fixtures.py
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from responses import encode_json, gzip_body
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).parent
+
+
+def split_list_field(data):
+    # 응답 파일의 목록 필드(trade, card 등)와 나머지 헤더 필드를 분리
+    key = next(k for k, v in data.items() if isinstance(v, list))
+    header = {k: v for k, v in data.items() if k != key}
+    return key, data[key], header
+
+
+class FixtureEntry:
+    def __init__(self, name, path, mtime, data, body, etag):
+        self.name = name
+        self.path = path
+        self.mtime = mtime
+        self.data = data
+        self.body = body
+        self.gzip_body = gzip_body(body)
+        self.etag = etag
+        self._derived = {}
+
+    def derive(self, key, build):
+        # 파일 내용에서 만들어지는 부가 데이터(변형 응답, 인덱스 등)를 파일이 다시 로딩될 때까지 캐시
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build(self)
+        return value
+
+
+class FixtureCache:
+    # 응답용 JSON 파일을 한 번만 파싱/직렬화해 두고, mtime이 바뀐 경우에만 다시 읽는다.
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = Path(base_dir)
+        self._entries = {}
+
+    def get(self, name):
+        path = self.base_dir / name
+        # 파일이 없으면 FileNotFoundError를 그대로 올려 핸들러에서 404로 처리
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(name)
+        if entry is None or entry.mtime != mtime:
+            entry = self._load(name, path, mtime)
+        return entry
+
+    def read(self, name):
+        # 저장소 초기 데이터처럼 한 번만 쓰는 파일은 캐시에 두지 않고 파싱만 한다
+        with open(self.base_dir / name, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def preload(self, names):
+        for name in names:
+            try:
+                self.get(name)
+            except FileNotFoundError:
+                logger.warning(f"Fixture not found, skipped: {name}")
+            except Exception as e:
+                logger.error(f"Error loading fixture {name}: {str(e)}")
+
+    def _load(self, name, path, mtime):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        # 파일 내용 해시 (ETag/버전 값으로 사용)
+        etag = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        entry = FixtureEntry(name, path, mtime, data, encode_json(data), etag)
+        self._entries[name] = entry
+        logger.info(f"Fixture loaded: {name} ({len(entry.body)} bytes)")
+        return entry
@@ -0,0 +1,79 @@
+# id_allocator.py
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def business_key(*fields, issued=""):
+    # 발급 키. 마지막 값(사업자 측 ID, 예: spcpid)이 비어 있으면 같은 키로 묶지 않고,
+    # 클라이언트가 보낸 발급 ID(issued)로 기존 건을 찾는다. 둘 다 없으면 마지막 값이 빈 키 (항상 새로 발급)
+    return fields if fields[-1] else (*fields, issued)
+
+
+class IdAllocator:
+    # 사업자 키(예: (spid, spcsid))마다 ID를 한 번만 발급한다. 형식은 spid + kind + 6자리 순번 (예: KECS000001).
+    # 이미 발급한 키는 dict 조회로 같은 ID를 돌려주고, 새 키는 spid별 순번으로 발급해 충돌이 없다.
+    # journal 경로가 있으면 요청마다 발급 내역([[키..., ID], ...])을 한 줄씩 추가 기록하고 시작 시 다시 읽어 들인다.
+    def __init__(self, kind, journal=None):
+        self.kind = kind
+        self.journal = journal
+        self._ids = {}
+        self._next = {}
+        self._file = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def open(self):
+        if not self.journal:
+            return
+        if os.path.exists(self.journal):
+            with open(self.journal, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    for *key, value in json.loads(line):
+                        self.remember(tuple(key), value)
+            logger.info(f"ID journal loaded: {self.journal} ({len(self._ids)} ids)")
+        os.makedirs(os.path.dirname(self.journal) or ".", exist_ok=True)
+        self._file = open(self.journal, "a", encoding="utf-8")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def allocate(self, keys):
+        # 키 목록(첫 요소는 spid)에 대해 [(ID, 새로 발급 여부)]를 반환
+        result = []
+        created = []
+        for key in keys:
+            value = self._ids.get(key)
+            if value is None:
+                spid = key[0]
+                seq = self._next.get(spid, 1)
+                value = f"{spid}{self.kind}{seq:06d}"
+                self._next[spid] = seq + 1
+                if not key[-1]:
+                    # 빈 키는 중복 판단에 쓰지 않고, 이후 요청이 발급 ID로 찾을 수 있게 등록
+                    key = (*key[:-1], value)
+                self._ids[key] = value
+                created.append([*key, value])
+                result.append((value, True))
+            else:
+                result.append((value, False))
+        if created and self._file is not None:
+            # 요청 한 건의 발급 내역을 한 줄로 기록
+            self._file.write(json.dumps(created, ensure_ascii=False) + "\n")
+            self._file.flush()
+        return result
+
+    def remember(self, key, value):
+        # 이미 발급된 ID 등록 (기록/저장소에서 다시 읽을 때)
+        self._ids[key] = value
+        spid = key[0]
+        seq = int(value[len(spid) + len(self.kind):])
+        if seq >= self._next.get(spid, 1):
+            self._next[spid] = seq + 1
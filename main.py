@@ -1,397 +1,584 @@
 # main.py
-from fastapi import FastAPI, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Form, Header, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
+import atexit
 import logging
-import json
-from pathlib import Path
-import random
+import os
+import zlib
+
+from models import Bid, Bkey, Trade, Use, Message, CardUpdateRequest, CardListRequest, TradeRegiRequest, UseRegiRequest, TradeListRequest, TradeStatRequest, ChargerStatusRequest, ChargerInfoListRequest, ChargerStatusUpdateRequest, ChargerQRRequest, ChargingStationUpdate, ChargerUpdate, ChargerStatusUpdate, UserInfoUpdate, EvapiListRequest, StationSearchRequest  # models.py에서 임포트
+from fixtures import FixtureCache, split_list_field
+from bulk import read_batches, validate_items
+from capture import CaptureMiddleware, CaptureWriter
+from card_store import CardStore
+from code_table import CodeTable
+from dedup import DedupIndex
+from id_allocator import IdAllocator, business_key
+from station_store import StationStore
+from status_store import StatusStore
+from storage import SqliteStorage
+from write_behind import WriteBehindQueue
+from trade_stats import aggregate
+from trade_store import TradeStore
+from paging import FixtureDataset, PagedDataset, StoreDataset
+from request_log import Payload, start_queue_logging
+from responses import FastJSONResponse, cached_json_response, encode_json, gzip_body, json_response, streaming_json_list
+from settings import PAGING_VIRTUAL_ROWS, DEDUP_WINDOW_DAYS, CAPTURE_ENABLED, CAPTURE_FILE, CAPTURE_MAX_BODY, GZIP_DYNAMIC_MIN_SIZE, BULK_ERRLIST_MAX, ID_JOURNAL_DIR, GEO_CELL_DEG, STORAGE_BACKEND, SQLITE_PATH
+from settings import WRITE_BEHIND_ENABLED, WRITE_BEHIND_QUEUE_SIZE, WRITE_BEHIND_MAX_ROWS, WRITE_BEHIND_INTERVAL, WRITE_BEHIND_RETRIES, WRITE_BEHIND_SPILL_FILE
+
+# 로깅 설정 (출력은 백그라운드 스레드에서 처리, 종료 시 남은 로그를 비운다)
+log_listener = start_queue_logging(logging.INFO)
+atexit.register(log_listener.stop)
+logger = logging.getLogger(__name__)
 
-from models import Message, CardUpdateRequest, CardListRequest, TradeRegiRequest, UseRegiRequest, TradeListRequest, ChargerStatusRequest, ChargerInfoListRequest, ChargerStatusUpdateRequest, ChargerQRRequest, ChargingStationUpdateRequest, ChargerUpdateRequest  # models.py에서 임포트
+# 응답으로 내려주는 JSON 파일 목록 (시작 시 미리 로딩)
+FIXTURE_FILES = [
+    'data.json',
+    'latest_card.json',
+    'card_list_kind1.json',
+    'charger_info_list_response.json',
+    'charger_status_list_response.json',
+    'latest_chargerinfo1.json',
+    'charger_info_list_response3.json',
+    'charger_qr_info_page1.json',
+    'charger_qr_info_page2.json',
+    'charger_qr_info_page3.json',
+]
+
+fixtures = FixtureCache()
+
+# 카드 저장소 (시작 시 카드 목록 파일로 초기화)
+card_store = CardStore()
+CARD_SEED_FILES = ['latest_card.json', 'card_list_kind1.json']
+
+# 충전이력/사용이력 중복 검사 인덱스
+trade_dedup = DedupIndex(DEDUP_WINDOW_DAYS)
+use_dedup = DedupIndex(DEDUP_WINDOW_DAYS)
+
+# 충전이력 저장소 (컬럼 배열, 시작 시 충전이력 목록 파일로 초기화)
+trade_store = TradeStore()
+TRADE_SEED_FILES = [
+    'trade_list_kind1_response.json',
+    'trade_list_kind1_response2.json',
+    'trade_list_kind1_response3.json',
+    'trade_list_kind1_response4.json',
+    'hyojun.json',
+]
+
+# 충전기 최신 상태 테이블 (r2: sid/cid, evapi: csid/cpid)
+charger_status_store = StatusStore(("sid", "cid"), "cstat")
+cp_status_store = StatusStore(("csid", "cpid"), "list")
+
+# 페이지 파일들을 합친 리소스별 데이터셋 (pageno/pagesize로 잘라서 응답)
+trade_dataset = StoreDataset(trade_store, "trade", virtual_rows=PAGING_VIRTUAL_ROWS)
+charger_info_dataset = FixtureDataset(fixtures, [
+    'latest_chargerinfo1.json',
+    'charger_info_list_response3.json',
+], PAGING_VIRTUAL_ROWS)
+charger_qr_dataset = FixtureDataset(fixtures, [
+    'charger_qr_info_page1.json',
+    'charger_qr_info_page2.json',
+    'charger_qr_info_page3.json',
+], PAGING_VIRTUAL_ROWS)
+
+# 충전소/충전기 ID 발급 (충전소: (spid, spcsid), 충전기: (spid, csid, spcpid) 키별로 한 번만)
+station_ids = IdAllocator("S", os.path.join(ID_JOURNAL_DIR, "station_ids.jsonl") if ID_JOURNAL_DIR else None)
+charger_ids = IdAllocator("E", os.path.join(ID_JOURNAL_DIR, "charger_ids.jsonl") if ID_JOURNAL_DIR else None)
+
+# 등록된 충전소 (csid 키, 위치 격자/지역 색인)
+station_store = StationStore(GEO_CELL_DEG)
+
+# 영속 저장소 (KECO_STORAGE=sqlite 일 때만, 조회는 메모리 저장소가 처리)
+storage = SqliteStorage(SQLITE_PATH) if STORAGE_BACKEND == "sqlite" else None
+# 저장소 기록을 요청과 분리 (KECO_WRITE_BEHIND=1 일 때만)
+write_behind = WriteBehindQueue(
+    storage, WRITE_BEHIND_QUEUE_SIZE, WRITE_BEHIND_MAX_ROWS, WRITE_BEHIND_INTERVAL,
+    WRITE_BEHIND_RETRIES, WRITE_BEHIND_SPILL_FILE
+) if storage and WRITE_BEHIND_ENABLED else None
+
+# 요청 캡처 (KECO_CAPTURE=1 일 때만)
+capture_writer = CaptureWriter(CAPTURE_FILE) if CAPTURE_ENABLED else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    fixtures.preload(FIXTURE_FILES)
+    seed_card_store()
+    seed_trade_store()
+    seed_charger_status_store()
+    station_ids.open()
+    charger_ids.open()
+    if storage:
+        storage.open()
+        hydrate_from_storage()
+    if write_behind:
+        write_behind.start()
+    if capture_writer:
+        capture_writer.start()
+    yield
+    station_ids.close()
+    charger_ids.close()
+    if write_behind:
+        # 남은 기록을 모두 쓴 뒤 저장소를 닫는다
+        await write_behind.drain()
+    if storage:
+        storage.close()
+    if capture_writer:
+        capture_writer.stop()
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+if GZIP_DYNAMIC_MIN_SIZE > 0:
+    # 동적 응답 즉시 압축 (Content-Encoding이 이미 있는 캐시 응답은 건너뜀)
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_DYNAMIC_MIN_SIZE)
+if capture_writer:
+    app.add_middleware(CaptureMiddleware, writer=capture_writer, max_body=CAPTURE_MAX_BODY)
+
+def form_model(model):
+    # messages 폼 필드의 JSON 문자열을 한 번에 모델로 파싱/검증 (json.loads 후 Model(**dict) 이중 생성 제거)
+    async def decode(messages: str = Form(...)):
+        try:
+            request_data = model.model_validate_json(messages)
+            logger.info("Received request data: %s", Payload(request_data))
+        except Exception as e:
+            logger.error(f"Validation error: {str(e)}")
+            raise HTTPException(status_code=422, detail=str(e))
+        return request_data
+    return Depends(decode)
+
+def seed_card_store():
+    for file_name in CARD_SEED_FILES:
+        try:
+            card_store.load(fixtures.get(file_name).data.get('card', []))
+            logger.info(f"Card store seeded from {file_name}: {len(card_store)} cards")
+            return
+        except FileNotFoundError:
+            continue
+
+def seed_trade_store():
+    # 여러 파일에 같은 충전이력이 있을 수 있어 자연키로 중복을 걸러서 적재
+    for file_name in TRADE_SEED_FILES:
+        try:
+            rows = fixtures.read(file_name).get('trade', [])
+        except FileNotFoundError:
+            continue
+        trade_store.load(row for row in rows if trade_dedup.add((row['no'], row['sid'], row['cid'], row['tsdt']), row['tsdt']))
+    logger.info(f"Trade store seeded: {len(trade_store)} trades")
+
+def seed_charger_status_store():
+    try:
+        key, rows, header = split_list_field(fixtures.get('charger_status_list_response.json').data)
+    except FileNotFoundError:
+        return
+    charger_status_store.list_key = key
+    charger_status_store.load(rows, header)
+    logger.info(f"Charger status store seeded: {len(charger_status_store)} rows")
+
+async def persist(save, rows):
+    # 저장소 기록: write-behind 모드면 큐에 넣고 바로 반환, 아니면 스레드풀에서 기록을 기다린다
+    # (SQLite 쓰기/체크포인트가 이벤트 루프를 막지 않도록)
+    if write_behind:
+        write_behind.put(save, rows)
+    else:
+        await run_in_threadpool(save, list(rows))
+
+async def check_write_queue():
+    # write-behind 큐가 가득 차면 메모리 저장소를 바꾸기 전에 재시도 가능한 오류로 응답
+    if write_behind and write_behind.full():
+        logger.error(f"Write-behind queue full ({write_behind.pending()} pending)")
+        raise HTTPException(status_code=503, detail="Storage queue is full, retry later.",
+                            headers={"Retry-After": "1"})
+
+def hydrate_from_storage():
+    # 저장소에 쌓인 등록/갱신 데이터로 메모리 저장소를 다시 채운다 (초기 데이터 파일 적재 후)
+    card_store.load(storage.load_cards())
+    trade_store.load(row for row in storage.load_trades()
+                     if trade_dedup.add((row['no'], row['sid'], row['cid'], row['tsdt']), row['tsdt']))
+    for key in storage.load_use_keys():
+        use_dedup.add(key, key[2])
+    charger_status_store.load(storage.load_charger_status())
+    cp_status_store.load(storage.load_cp_status())
+    for station in storage.load_stations():
+        station_store.put(station)
+        station_ids.remember(business_key(station['spid'], station['spcsid'], issued=station['csid']), station['csid'])
+    for charger in storage.load_chargers():
+        charger_ids.remember(
+            business_key(charger['spid'], charger['csid'], charger['spcpid'], issued=charger['cpid']), charger['cpid'])
+    logger.info(f"Hydrated from storage: {len(card_store)} cards, {len(trade_store)} trades, "
+                f"{len(station_store)} stations")
+
+def load_fixture(file_name):
+    try:
+        return fixtures.get(file_name)
+    except FileNotFoundError:
+        logger.error(f"File not found: {fixtures.base_dir / file_name}")
+        raise HTTPException(status_code=404, detail="Requested data not found.")
+    except Exception as e:
+        logger.error(f"Error reading the file: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
 
-app = FastAPI()
+def etag_matches(if_none_match, etag):
+    # If-None-Match: "a", W/"b" 또는 * 형식
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+def query_trades(request_data):
+    # 기간(sdate~edate)/카드번호 조건이 있으면 정렬 인덱스로 찾은 행만, 없으면 None (전체)
+    if request_data.sdate is None and request_data.edate is None and request_data.no is None:
+        return None
+    return trade_store.select(trade_store.query(request_data.sdate, request_data.edate, request_data.no))
 
-def generate_random_number():
-    return str(random.randint(100000, 999999))
+def fixture_response(file_name, accept_encoding=None, log_prefix="Response data"):
+    # 캐시된 직렬화 결과(bytes, gzip 압축본)를 그대로 응답
+    entry = load_fixture(file_name)
 
-@app.post("/r2/code/list")
-async def code_list(messages: str = Form(...)):
+    logger.info("%s: %s", log_prefix, Payload(entry.data))
+
+    return cached_json_response(entry.body, entry.gzip_body, accept_encoding)
+
+def paged_response(dataset, pageno, pagesize, accept_encoding=None):
+    # 전체 데이터셋에서 요청한 페이지만 잘라 직렬화 (O(pagesize))
     try:
-        parsed_data = json.loads(messages)
-        request_data = Message(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
+        body, gzipped = dataset.get().render(pageno, pagesize)
+    except FileNotFoundError as e:
+        logger.error(f"File not found: {str(e)}")
+        raise HTTPException(status_code=404, detail="Requested data not found.")
     except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+        logger.error(f"Error reading the file: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
 
-    with open('data.json', 'r', encoding='utf-8') as f:
-        response_content = json.load(f)
+    logger.info(f"Response data for pageno {pageno}: {len(body)} bytes")
 
-    return JSONResponse(content=response_content)
+    return cached_json_response(body, gzipped, accept_encoding)
 
-@app.post("/r2/card/update")
-async def update_card(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = CardUpdateRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+@app.post("/r2/code/list")
+async def code_list(request_data: Message = form_model(Message), if_none_match: Optional[str] = Header(None),
+                    accept_encoding: Optional[str] = Header(None)):
+    # 공통코드는 거의 바뀌지 않으므로 파일 해시를 ETag/ver 값으로 내려주고,
+    # 클라이언트가 같은 값을 보내면 본문 없이 응답
+    entry = load_fixture('data.json')
+    etag = f'"{entry.etag}"'
+    headers = {"ETag": etag}
+
+    if etag_matches(if_none_match, etag):
+        logger.info(f"Response data: not modified ({entry.etag})")
+        return Response(status_code=304, headers=headers)
+
+    if request_data.ver == entry.etag:
+        logger.info(f"Response data: not modified ({entry.etag})")
+        return FastJSONResponse(content={"result": "0", "ver": entry.etag, "ccode": [], "rcnt": 0}, headers=headers)
+
+    if request_data.id is not None or request_data.code is not None:
+        # 색인에서 필요한 행만 찾아 응답 (전체 목록을 내려주지 않음)
+        table = entry.derive("code_table", lambda e: CodeTable(e.data.get("ccode", [])))
+        rows = table.lookup(request_data.id, request_data.code)
+        response_data = {"result": "0", "ccode": rows, "rcnt": len(rows),
+                         "rdate": entry.data.get("rdate"), "ver": entry.etag}
+        logger.info(f"Response data: {len(rows)} of {len(table)} codes (id={request_data.id}, code={request_data.code})")
+        return FastJSONResponse(content=response_data, headers=headers)
+
+    body = entry.derive("versioned", lambda e: encode_json({**e.data, "ver": e.etag}))
+    gzipped = entry.derive("versioned.gz", lambda e: gzip_body(body))
+    logger.info("Response data: %s", Payload(entry.data))
+
+    return cached_json_response(body, gzipped, accept_encoding, headers)
+
+@app.post("/r2/card/update", dependencies=[Depends(check_write_queue)])
+async def update_card(request_data: CardUpdateRequest = form_model(CardUpdateRequest)):
+    rdate = datetime.now().strftime('%Y%m%d%H%M%S')
+    inscnt, updcnt, dupcnt = card_store.update(request_data.bid, request_data.card, rdate)
+    if storage and inscnt + updcnt:
+        await persist(storage.save_cards, (card_store.get(item.no) for item in request_data.card))
 
     response_data = {
         "result": "0",
-        "rdate": datetime.now().strftime('%Y%m%d%H%M%S'),
+        "rdate": rdate,
         "reqcnt": len(request_data.card),
-        "inscnt": 0,
-        "updcnt": len(request_data.card),
-        "dupcnt": 0,
+        "inscnt": inscnt,
+        "updcnt": updcnt,
+        "dupcnt": dupcnt,
         "limitcnt": 0,
         "errcnt": 0,
         "errlist": []
     }
-    logger.info(f"Response data: {response_data}")
+    logger.info("Response data: %s", Payload(response_data))
 
-    return JSONResponse(content=response_data)
+    return FastJSONResponse(content=response_data)
 
 @app.post("/r2/card/list")
-async def list_card(messages: str = Form(...)):
-    try:
-        # 클라이언트가 보낸 messages 필드의 JSON 데이터를 파싱하여 Pydantic 모델로 변환
-        parsed_data = json.loads(messages)
-        request_data = CardListRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-
-    # card_list_kind1.json 파일 경로
-    file_path = Path(__file__).parent / 'latest_card.json'
+async def list_card(request_data: CardListRequest = form_model(CardListRequest)):
+    now = datetime.now()
+    if request_data.kind == "1":
+        # 전체 목록
+        cards = card_store.list_since()
+    else:
+        # 변경분 목록: upddate 인덱스 범위 스캔
+        cards = card_store.list_since(request_data.upddate or now.strftime('%Y%m%d000000'))
 
+    response_data = {
+        "result": "0",
+        "rowcnt": len(cards),
+        "rdate": now.strftime('%Y%m%d%H%M%S'),
+        "card": cards
+    }
+    logger.info(f"Response data: {len(cards)} cards")
+
+    return Response(content=encode_json(response_data), media_type="application/json")
+
+async def register_trades(bid, items, rdate):
+    # 자연키(no/sid/cid/tsdt) 기준 중복 검사 후 새 이력만 저장, 중복 항목의 errlist 반환
+    errlist = []
+    new_items = []
+    for item in items:
+        if trade_dedup.add((item.no, item.sid, item.cid, item.tsdt), item.tsdt):
+            new_items.append(item)
+        else:
+            errlist.append({"no": item.no, "sid": item.sid, "cid": item.cid, "tsdt": item.tsdt, "errmsg": "중복 데이터"})
+    start = len(trade_store)
+    try:
+        trade_store.insert(bid, new_items, rdate)
+    finally:
+        # 저장 중 오류가 나면 저장하지 못한 행의 키는 중복 인덱스에서 빼서 재전송할 수 있게 하고,
+        # 이미 들어간 행은 그대로 영속 저장소에도 기록한다
+        stored = len(trade_store) - start
+        for item in new_items[stored:]:
+            trade_dedup.discard((item.no, item.sid, item.cid, item.tsdt), item.tsdt)
+        if storage and stored:
+            # 저장소에는 발급된 tseq까지 포함한 목록 형식 행으로 기록
+            await persist(storage.save_trades, trade_store[start:start + stored])
+    return errlist
+
+async def register_uses(bid, items, rdate):
+    # 자연키(sid/cid/tsdt) 기준 중복 검사, 중복 항목의 errlist 반환
+    errlist = []
+    new_rows = []
+    for item in items:
+        if use_dedup.add((item.sid, item.cid, item.tsdt), item.tsdt):
+            new_rows.append({**item.model_dump(), "bid": bid, "regdate": rdate})
+        else:
+            errlist.append({"sid": item.sid, "cid": item.cid, "tsdt": item.tsdt, "errmsg": "중복 데이터"})
+    if storage:
+        await persist(storage.save_uses, new_rows)
+    return errlist
+
+async def bulk_register(request, bid, model, register):
+    # NDJSON(gzip 가능) 본문을 받는 대로 BULK_CHUNK_ROWS 행씩 검증/등록하고 regi와 같은 형식으로 응답
+    rdate = datetime.now().strftime('%Y%m%d%H%M%S')
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+    reqcnt = dupcnt = errcnt = 0
+    errlist = []
     try:
-        # JSON 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
+        async for items, errors in read_batches(request.stream(), model, gzipped):
+            if write_behind:
+                # 대량 등록은 오류 대신 기록 큐에 자리가 날 때까지 본문 읽기를 늦춘다
+                await write_behind.wait_for_space()
+            duplicates = await register(bid, items, rdate)
+            reqcnt += len(items) + len(errors)
+            dupcnt += len(duplicates)
+            errcnt += len(errors)
+            # 응답 크기를 제한하기 위해 errlist는 앞에서부터 BULK_ERRLIST_MAX 건까지만
+            errlist.extend((errors + duplicates)[:max(0, BULK_ERRLIST_MAX - len(errlist))])
+    except zlib.error as e:
+        logger.error(f"Bulk body decompress error: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Invalid gzip body: {str(e)}")
 
-        # 응답 데이터를 로깅
-        logger.info(f"Response data: {file_data}")
+    response_data = {
+        "result": "0",
+        "rdate": rdate,
+        "reqcnt": reqcnt,
+        "inscnt": reqcnt - dupcnt - errcnt,
+        "dupcnt": dupcnt,
+        "limitcnt": 0,
+        "errcnt": errcnt,
+        "errlist": errlist
+    }
+    logger.info("Response data: %s", Payload(response_data))
 
-        # 파일 내용을 그대로 반환
-        return JSONResponse(content=file_data)
+    return FastJSONResponse(content=response_data)
 
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+@app.post("/r2/trade/regi/bulk")
+async def trade_regi_bulk(request: Request, bid: Bid = Query(...), bkey: str = Query(...)):
+    # 본문: 한 줄에 Trade 하나씩인 NDJSON (Content-Encoding: gzip 가능), bid/bkey는 쿼리로
+    return await bulk_register(request, bid, Trade, register_trades)
 
-@app.post("/r2/trade/regi")
-async def trade_regi(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = TradeRegiRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+@app.post("/r2/use/regi/bulk")
+async def use_regi_bulk(request: Request, bid: Bid = Query(...), bkey: Bkey = Query(...)):
+    # 본문: 한 줄에 Use 하나씩인 NDJSON (Content-Encoding: gzip 가능), bid/bkey는 쿼리로
+    return await bulk_register(request, bid, Use, register_uses)
+
+@app.post("/r2/trade/regi", dependencies=[Depends(check_write_queue)])
+async def trade_regi(request_data: TradeRegiRequest = form_model(TradeRegiRequest)):
+    rdate = datetime.now().strftime('%Y%m%d%H%M%S')
+    errlist = await register_trades(request_data.bid, request_data.trade, rdate)
+    dupcnt = len(errlist)
 
     response_data = {
         "result": "0",
-        "rdate": datetime.now().strftime('%Y%m%d%H%M%S'),
+        "rdate": rdate,
         "reqcnt": len(request_data.trade),
-        "inscnt": len(request_data.trade),  # 실제 등록된 건수로 수정 필요
-        "dupcnt": 0,  # 중복 건수로 수정 필요
+        "inscnt": len(request_data.trade) - dupcnt,
+        "dupcnt": dupcnt,
         "limitcnt": 0,
         "errcnt": 0,
-        "errlist": []
+        "errlist": errlist
     }
-    logger.info(f"Response data: {response_data}")
+    logger.info("Response data: %s", Payload(response_data))
 
-    return JSONResponse(content=response_data)
+    return FastJSONResponse(content=response_data)
 
-@app.post("/r2/use/regi")
-async def use_regi(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = UseRegiRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+@app.post("/r2/use/regi", dependencies=[Depends(check_write_queue)])
+async def use_regi(request_data: UseRegiRequest = form_model(UseRegiRequest)):
+    rdate = datetime.now().strftime('%Y%m%d%H%M%S')
+    errlist = await register_uses(request_data.bid, request_data.use, rdate)
+    dupcnt = len(errlist)
 
     response_data = {
         "result": "0",
-        "rdate": datetime.now().strftime('%Y%m%d%H%M%S'),
+        "rdate": rdate,
         "reqcnt": len(request_data.use),
-        "inscnt": len(request_data.use),  # 실제 등록된 건수로 수정 필요
-        "dupcnt": 0,  # 중복 건수로 수정 필요
+        "inscnt": len(request_data.use) - dupcnt,
+        "dupcnt": dupcnt,
         "limitcnt": 0,
         "errcnt": 0,
-        "errlist": []
+        "errlist": errlist
     }
-    logger.info(f"Response data: {response_data}")
+    logger.info("Response data: %s", Payload(response_data))
 
-    return JSONResponse(content=response_data)
+    return FastJSONResponse(content=response_data)
 
 @app.post("/r2/trade/listall")
-async def trade_list(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = TradeListRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-
-    # pageno에 따라 파일 경로 설정
-    file_map = {
-        "1": 'trade_list_kind1_response.json',
-        "2": 'trade_list_kind1_response2.json',
-        "3": 'trade_list_kind1_response3.json',
-        "4": 'trade_list_kind1_response4.json'
-    }
-
-    # pageno 가져오기
-    pageno = str(parsed_data.get("pageno", "1"))
-    
-    if pageno not in file_map:
-        logger.error(f"Invalid pageno: {pageno}")
-        raise HTTPException(status_code=400, detail="Invalid pageno")
-
-    file_name = file_map[pageno]
-    file_path = Path(__file__).parent / file_name
+async def trade_listall(request_data: TradeListRequest = form_model(TradeListRequest),
+                        accept_encoding: Optional[str] = Header(None)):
+    rows = query_trades(request_data)
+    if rows is None:
+        # 요청한 페이지만 잘라서 응답
+        return paged_response(trade_dataset, request_data.pageno, request_data.pagesize, accept_encoding)
+
+    # 조회 결과는 한 번 쓰고 버리므로 페이지 캐시/사전 압축 없이 직렬화만 한다
+    body = encode_json(PagedDataset("trade", rows).content(request_data.pageno, request_data.pagesize))
+    logger.info(f"Response data for pageno {request_data.pageno}: {len(rows)} matched trades, {len(body)} bytes")
+
+    return json_response(body, accept_encoding)
+
+@app.post("/r2/trade/stat")
+async def trade_stat(request_data: TradeStatRequest = form_model(TradeStatRequest)):
+    # 충전소/충전기/기관별 건수, 충전량, 금액 합계와 평균 단가
+    rows = None
+    if request_data.sdate is not None or request_data.edate is not None:
+        rows = trade_store.query(request_data.sdate, request_data.edate)
+    stats = aggregate(trade_store, request_data.group, rows)
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data for pageno {pageno}: {file_data}")
+    response_data = {
+        "result": "0",
+        "rdate": datetime.now().strftime('%Y%m%d%H%M%S'),
+        "group": request_data.group,
+        "rowcnt": len(stats),
+        "stat": stats
+    }
+    logger.info(f"Response data: {len(stats)} {request_data.group} groups")
 
-        return JSONResponse(content=file_data)
+    return FastJSONResponse(content=response_data)
 
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
 @app.post("/r2/charger/info/list")
-async def charger_info_list(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = ChargerInfoListRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+async def charger_info_list(request_data: ChargerInfoListRequest = form_model(ChargerInfoListRequest),
+                            accept_encoding: Optional[str] = Header(None)):
+    return fixture_response('charger_info_list_response.json', accept_encoding)
 
-    file_path = Path(__file__).parent / 'charger_info_list_response.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data: {file_data}")
-
-        return JSONResponse(content=file_data)
-
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
-
-@app.post("/r2/charger/status/update")
-async def charger_status_update(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = ChargerStatusUpdateRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
+@app.post("/r2/charger/status/update", dependencies=[Depends(check_write_queue)])
+async def charger_status_update(request_data: ChargerStatusUpdateRequest = form_model(ChargerStatusUpdateRequest)):
+    rows = [item.model_dump() for item in request_data.cstat]
+    updcnt = charger_status_store.update(rows)
+    if storage:
+        await persist(storage.save_charger_status, rows)
 
     response_data = {
         "result": "0",
         "rdate": datetime.now().strftime('%Y%m%d%H%M%S'),
         "reqcnt": len(request_data.cstat),
-        "updcnt": len(request_data.cstat),  # 실제 갱신된 건수로 수정 필요
+        "updcnt": updcnt,
         "limitcnt": 0,
         "errcnt": 0,
         "errlist": []
     }
-    logger.info(f"Response data: {response_data}")
+    logger.info("Response data: %s", Payload(response_data))
 
-    return JSONResponse(content=response_data)
+    return FastJSONResponse(content=response_data)
 
 @app.post("/r2/charger/status/list")
-async def charger_status_list(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = ChargerStatusRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-
-    file_path = Path(__file__).parent / 'charger_status_list_response.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data: {file_data}")
+async def charger_status_list(request_data: ChargerStatusRequest = form_model(ChargerStatusRequest)):
+    body = await charger_status_store.render(datetime.now().strftime('%Y%m%d%H%M%S'))
+    logger.info(f"Response data: {len(charger_status_store)} charger status rows")
 
-        return JSONResponse(content=file_data)
-
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+    return Response(content=body, media_type="application/json")
 
 @app.post("/r2/charger/info/listall")
-async def charger_info_listall(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = ChargerInfoListRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-
-    # pageno에 따라 파일 경로 설정
-    file_map = {
-        "1": 'latest_chargerinfo1.json',
-        "2": 'charger_info_list_response3.json'
-    }
-
-    # pageno 가져오기
-    pageno = str(parsed_data.get("pageno", "1"))
-    
-    if pageno not in file_map:
-        logger.error(f"Invalid pageno: {pageno}")
-        raise HTTPException(status_code=400, detail="Invalid pageno")
-
-    file_name = file_map[pageno]
-    file_path = Path(__file__).parent / file_name
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data for pageno {pageno}: {file_data}")
-
-        return JSONResponse(content=file_data)
-
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+async def charger_info_listall(request_data: ChargerInfoListRequest = form_model(ChargerInfoListRequest),
+                               accept_encoding: Optional[str] = Header(None)):
+    # 요청한 페이지만 잘라서 응답
+    return paged_response(charger_info_dataset, request_data.pageno, request_data.pagesize, accept_encoding)
 
 @app.post("/r2/trade/list")
-async def trade_list(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = TradeListRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-    #937건
-    file_path = Path(__file__).parent / 'hyojun.json'
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data: {file_data}")
-
-        return JSONResponse(content=file_data)
-
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+async def trade_list(request_data: TradeListRequest = form_model(TradeListRequest)):
+    rows = query_trades(request_data)
+    if rows is None:
+        count = len(trade_store)
+        rows = trade_store.iter_rows(0, count)
+    else:
+        count = len(rows)
+    logger.info(f"Response data: streaming {count} trade rows")
+
+    # 전체 본문을 메모리에 만들지 않고 행 묶음 단위로 dict로 복원하며 스트리밍
+    return streaming_json_list({"result": "0"}, "trade", rows)
 
 @app.post("/p1/charger/qr")
-async def charger_qr_info(messages: str = Form(...)):
-    try:
-        parsed_data = json.loads(messages)
-        request_data = ChargerQRRequest(**parsed_data)
-        logger.info(f"Received request data: {request_data}")
-    except Exception as e:
-        logger.error(f"Validation error: {str(e)}")
-        raise HTTPException(status_code=422, detail=str(e))
-
-    # pageno에 따라 파일 경로 설정
-    file_map = {
-        "1": 'charger_qr_info_page1.json',
-        "2": 'charger_qr_info_page2.json',
-        "3": 'charger_qr_info_page3.json'
-    }
-
-    pageno = str(parsed_data.get("pageno", "1"))
-    
-    if pageno not in file_map:
-        logger.error(f"Invalid pageno: {pageno}")
-        raise HTTPException(status_code=400, detail="Invalid pageno")
-
-    file_name = file_map[pageno]
-    file_path = Path(__file__).parent / file_name
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-
-        logger.info(f"Response data for pageno {pageno}: {file_data}")
-        return JSONResponse(content=file_data)
-
-    except FileNotFoundError:
-        logger.error(f"File not found: {file_path}")
-        raise HTTPException(status_code=404, detail="Requested data not found.")
-    except Exception as e:
-        logger.error(f"Error reading the file: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
+async def charger_qr_info(request_data: ChargerQRRequest = form_model(ChargerQRRequest),
+                          accept_encoding: Optional[str] = Header(None)):
+    # 요청한 페이지만 잘라서 응답
+    return paged_response(charger_qr_dataset, request_data.pageno, request_data.pagesize, accept_encoding)
 
-@app.post("/evapi/v200/{spid}/cs/update")
-async def update_charging_station(spid: str, request_data: dict):
+@app.post("/evapi/v200/{spid}/cs/update", dependencies=[Depends(check_write_queue)])
+async def update_charging_station(spid: str, request_data: EvapiListRequest):
     try:
-        logger.info(f"Received request data: {request_data}")
-        list_data = request_data.get('list', [])
+        logger.info("Received request data: %s", Payload(request_data))
+        list_data = request_data.list
         
         current_time = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        # 항목별로 검증해 정상 건만 처리하고, 오류 건은 errlist로 돌려준다
+        items, errlist = validate_items(ChargingStationUpdate, list_data, ("spid", "spcsid"))
+        # 같은 (spid, spcsid)는 재전송해도 같은 csid (기존 건은 수정으로 집계).
+        # spcsid가 없으면 보낸 csid로 기존 건을 찾고, csid도 없으면 새로 발급
+        ids = station_ids.allocate([business_key(item.spid, item.spcsid, issued=item.csid) for item in items])
+        ins_cnt = sum(1 for _, created in ids if created)
+        stations = [{**item.model_dump(), "csid": csid} for item, (csid, _) in zip(items, ids)]
+        for station in stations:
+            station_store.put(station)
+        if storage:
+            await persist(storage.save_stations, stations)
         
         response_data = {
             "result": "0",
             "errcode": "",
             "resultmsg": "",
             "datetime": current_time,
-            "errlist": [],
+            "errlist": errlist,
             "snd_cnt": len(list_data),
             "rcv_cnt": 0,
-            "nor_cnt": len(list_data),
-            "ins_cnt": len(list_data),
-            "upd_cnt": 0,
-            "err_cnt": 0,
+            "nor_cnt": len(items),
+            "ins_cnt": ins_cnt,
+            "upd_cnt": len(items) - ins_cnt,
+            "err_cnt": len(errlist),
             "list": [
                 {
-                    "spid": item['spid'],
-                    "csid": f"{item['spid']}S{generate_random_number()}",
-                    "spcsid": item['spcsid']
-                } for item in list_data
+                    "spid": item.spid,
+                    "csid": csid,
+                    "spcsid": item.spcsid
+                } for item, (csid, _) in zip(items, ids)
             ]
         }
 
@@ -401,30 +588,20 @@ async def update_charging_station(spid: str, request_data: dict):
                 "errcode": "600",
                 "resultmsg": "조회/처리 데이터 없음"
             })
-        
-        return JSONResponse(content=response_data)
-        
-    except KeyError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return JSONResponse(
-            content={
+        elif not items:
+            logger.error(f"Validation error: all {len(errlist)} rows rejected")
+            response_data.update({
                 "result": "2",
                 "errcode": "300",
-                "resultmsg": f"필수 필드 누락: {str(e)}",
-                "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
-                "errlist": [],
-                "snd_cnt": 0,
-                "rcv_cnt": 0,
-                "nor_cnt": 0,
-                "ins_cnt": 0,
-                "upd_cnt": 0,
-                "err_cnt": 1
-            },
-            status_code=400
-        )
+                "resultmsg": "필수 필드 누락 또는 형식 오류"
+            })
+            return FastJSONResponse(content=response_data, status_code=400)
+        
+        return FastJSONResponse(content=response_data)
+        
     except Exception as e:
         logger.error(f"System error: {str(e)}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "result": "2",
                 "errcode": "100",
@@ -441,34 +618,67 @@ async def update_charging_station(spid: str, request_data: dict):
             status_code=500
         )
 
-@app.post("/evapi/v200/{spid}/cp/update")
-async def update_charger(spid: str, request_data: dict):
+@app.post("/evapi/v200/{spid}/cs/search")
+async def search_charging_station(spid: str, request_data: StationSearchRequest):
+    # 반경(lat/longi/radius km) 또는 시도/시군구로 등록된 충전소 중 경로의 사업자(spid) 것만 조회 (open_yn/use_yn 필터)
+    filters = {"spid": spid, "open_yn": request_data.open_yn, "use_yn": request_data.use_yn}
+    if request_data.lat is not None and request_data.longi is not None:
+        found = station_store.nearby(request_data.lat, request_data.longi, request_data.radius,
+                                     request_data.limit, **filters)
+        stations = [{**station, "dist": round(dist, 3)} for dist, station in found]
+    else:
+        stations = station_store.in_region(request_data.sido, request_data.sigungu, request_data.limit, **filters)
+
+    response_data = {
+        "result": "0",
+        "errcode": "" if stations else "600",
+        "resultmsg": "" if stations else "조회/처리 데이터 없음",
+        "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
+        "rcv_cnt": len(stations),
+        "list": stations
+    }
+    logger.info(f"Response data: {len(stations)} of {len(station_store)} stations")
+
+    return FastJSONResponse(content=response_data)
+
+@app.post("/evapi/v200/{spid}/cp/update", dependencies=[Depends(check_write_queue)])
+async def update_charger(spid: str, request_data: EvapiListRequest):
     try:
-        logger.info(f"Received request data: {request_data}")
-        list_data = request_data.get('list', [])
+        logger.info("Received request data: %s", Payload(request_data))
+        list_data = request_data.list
         
         current_time = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        # 항목별로 검증해 정상 건만 처리하고, 오류 건은 errlist로 돌려준다
+        items, errlist = validate_items(ChargerUpdate, list_data, ("spid", "csid", "spcsid", "spcpid"))
+        # 같은 (spid, csid, spcpid)는 재전송해도 같은 cpid (기존 건은 수정으로 집계).
+        # spcpid가 없으면 보낸 cpid로 기존 건을 찾고, cpid도 없으면 새로 발급
+        ids = charger_ids.allocate(
+            [business_key(item.spid, item.csid, item.spcpid, issued=item.cpid) for item in items])
+        ins_cnt = sum(1 for _, created in ids if created)
+        if storage:
+            await persist(storage.save_chargers, ({**item.model_dump(), "cpid": cpid} for item, (cpid, _) in zip(items, ids)))
         
         response_data = {
             "result": "0",
             "errcode": "",
             "resultmsg": "",
             "datetime": current_time,
-            "errlist": [],
+            "errlist": errlist,
             "snd_cnt": len(list_data),
             "rcv_cnt": 0,
-            "nor_cnt": len(list_data),
-            "ins_cnt": len(list_data),
-            "upd_cnt": 0,
-            "err_cnt": 0,
+            "nor_cnt": len(items),
+            "ins_cnt": ins_cnt,
+            "upd_cnt": len(items) - ins_cnt,
+            "err_cnt": len(errlist),
             "list": [
                 {
-                    "spid": item['spid'],
-                    "csid": item['csid'],
-                    "cpid": f"{item['spid']}E{generate_random_number()}",
-                    "spcsid": item['spcsid'],
-                    "spcpid": item['spcpid']
-                } for item in list_data
+                    "spid": item.spid,
+                    "csid": item.csid,
+                    "cpid": cpid,
+                    "spcsid": item.spcsid,
+                    "spcpid": item.spcpid
+                } for item, (cpid, _) in zip(items, ids)
             ]
         }
 
@@ -478,30 +688,20 @@ async def update_charger(spid: str, request_data: dict):
                 "errcode": "600",
                 "resultmsg": "조회/처리 데이터 없음"
             })
-        
-        return JSONResponse(content=response_data)
-        
-    except KeyError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return JSONResponse(
-            content={
+        elif not items:
+            logger.error(f"Validation error: all {len(errlist)} rows rejected")
+            response_data.update({
                 "result": "2",
                 "errcode": "300",
-                "resultmsg": f"필수 필드 누락: {str(e)}",
-                "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
-                "errlist": [],
-                "snd_cnt": 0,
-                "rcv_cnt": 0,
-                "nor_cnt": 0,
-                "ins_cnt": 0,
-                "upd_cnt": 0,
-                "err_cnt": 1
-            },
-            status_code=400
-        )
+                "resultmsg": "필수 필드 누락 또는 형식 오류"
+            })
+            return FastJSONResponse(content=response_data, status_code=400)
+        
+        return FastJSONResponse(content=response_data)
+        
     except Exception as e:
         logger.error(f"System error: {str(e)}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "result": "2",
                 "errcode": "100",
@@ -518,32 +718,44 @@ async def update_charger(spid: str, request_data: dict):
             status_code=500
         )
 
-@app.post("/evapi/v200/{spid}/cp/status/update")
-async def update_charger_status(spid: str, request_data: dict):
+@app.post("/evapi/v200/{spid}/cp/status/update", dependencies=[Depends(check_write_queue)])
+async def update_charger_status(spid: str, request_data: EvapiListRequest):
     try:
-        logger.info(f"Received request data: {request_data}")
-        list_data = request_data.get('list', [])
+        logger.info("Received request data: %s", Payload(request_data))
+        list_data = request_data.list
         
         current_time = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        # 항목별로 검증해 정상 건만 최신 상태 테이블에 반영
+        items, errlist = validate_items(ChargerStatusUpdate, list_data, ("spid", "csid", "cpid"))
+        item_data = [item.model_dump() for item in items]
         
+        rows = [
+            {
+                "spid": item['spid'],
+                "csid": item['csid'],
+                "cpid": item['cpid'],
+                "spcsid": item['spcsid'],
+                "spcpid": item['spcpid'],
+                "update_time": item['update_time']
+            } for item in item_data
+        ]
+
+        # 충전기별 최신 1건만, 저장된 update_time 이후의 갱신만 반영
+        applied = cp_status_store.update_latest(item_data, 'update_time')
+        if storage:
+            await persist(storage.save_cp_status, (item_data[i] for i in applied))
+
         response_data = {
             "result": "0",
             "datetime": current_time,
             "snd_cnt": len(list_data),
-            "nor_cnt": len(list_data),
+            "nor_cnt": len(items),
             "ins_cnt": 0,  # 상태 업데이트는 신규등록이 아님
-            "upd_cnt": len(list_data),  # 모두 업데이트로 처리
-            "err_cnt": 0,
-            "list": [
-                {
-                    "spid": item['spid'],
-                    "csid": item['csid'],
-                    "cpid": item['cpid'],
-                    "spcsid": item['spcsid'],
-                    "spcpid": item['spcpid'],
-                    "update_time": item['update_time']
-                } for item in list_data
-            ]
+            "upd_cnt": len(applied),  # 오래된/중복 갱신은 정상 처리하되 갱신 건수에서 제외
+            "err_cnt": len(errlist),
+            "errlist": errlist,
+            "list": [rows[i] for i in applied]
         }
 
         if not list_data:
@@ -556,27 +768,16 @@ async def update_charger_status(spid: str, request_data: dict):
                 "err_cnt": 0,
                 "list": []
             })
+        elif not items:
+            logger.error(f"Validation error: all {len(errlist)} rows rejected")
+            response_data["result"] = "2"
+            return FastJSONResponse(content=response_data, status_code=400)
         
-        return JSONResponse(content=response_data)
+        return FastJSONResponse(content=response_data)
         
-    except KeyError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return JSONResponse(
-            content={
-                "result": "2",
-                "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
-                "snd_cnt": 0,
-                "nor_cnt": 0,
-                "ins_cnt": 0,
-                "upd_cnt": 0,
-                "err_cnt": 1,
-                "list": []
-            },
-            status_code=400
-        )
     except Exception as e:
         logger.error(f"System error: {str(e)}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "result": "2",
                 "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
@@ -591,26 +792,30 @@ async def update_charger_status(spid: str, request_data: dict):
         )
 
 @app.post("/evapi/v200/{spid}/uid/update")
-async def update_user_info(spid: str, request_data: dict):
+async def update_user_info(spid: str, request_data: EvapiListRequest):
     try:
-        logger.info(f"Received request data: {request_data}")
-        list_data = request_data.get('list', [])
+        logger.info("Received request data: %s", Payload(request_data))
+        list_data = request_data.list
         
         current_time = datetime.now().strftime('%Y%m%d%H%M%S')
+
+        # 항목별로 검증해 정상 건만 처리하고, 오류 건은 errlist로 돌려준다
+        items, errlist = validate_items(UserInfoUpdate, list_data, ("spid", "cardno"))
         
         response_data = {
             "result": "0",
             "datetime": current_time,
             "snd_cnt": len(list_data),
-            "nor_cnt": len(list_data),
+            "nor_cnt": len(items),
             "ins_cnt": 0,  # 회원정보 업데이트는 신규등록이 아님
-            "upd_cnt": len(list_data),  # 모두 업데이트로 처리
-            "err_cnt": 0,
+            "upd_cnt": len(items),  # 정상 건은 모두 업데이트로 처리
+            "err_cnt": len(errlist),
+            "errlist": errlist,
             "list": [
                 {
-                    "spid": item['spid'],
-                    "cardno": item['cardno']
-                } for item in list_data
+                    "spid": item.spid,
+                    "cardno": item.cardno
+                } for item in items
             ]
         }
 
@@ -624,27 +829,16 @@ async def update_user_info(spid: str, request_data: dict):
                 "err_cnt": 0,
                 "list": []
             })
+        elif not items:
+            logger.error(f"Validation error: all {len(errlist)} rows rejected")
+            response_data["result"] = "2"
+            return FastJSONResponse(content=response_data, status_code=400)
         
-        return JSONResponse(content=response_data)
+        return FastJSONResponse(content=response_data)
         
-    except KeyError as e:
-        logger.error(f"Validation error: {str(e)}")
-        return JSONResponse(
-            content={
-                "result": "2",
-                "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
-                "snd_cnt": 0,
-                "nor_cnt": 0,
-                "ins_cnt": 0,
-                "upd_cnt": 0,
-                "err_cnt": 1,
-                "list": []
-            },
-            status_code=400
-        )
     except Exception as e:
         logger.error(f"System error: {str(e)}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "result": "2",
                 "datetime": datetime.now().strftime('%Y%m%d%H%M%S'),
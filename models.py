@@ -1,83 +1,50 @@
 # models.py
-from pydantic import BaseModel, validator
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, model_validator
+from typing import Annotated, Any, List, Literal, Optional
+
+from settings import DEFAULT_PAGE_SIZE
+
+# 공통 필드 타입 (검증은 pydantic-core에서 길이/패턴/리터럴 제약으로 처리)
+Bid = Literal['EV', 'KP']  # bid는 "EV" 또는 "KP"
+Bkey = Annotated[str, StringConstraints(min_length=16, max_length=16)]  # bkey는 16자리
+Kind = Literal['1', '2', '3']  # kind는 "1", "2", "3" 중 하나
+YN = Literal['Y', 'N']
+CardNo = Annotated[str, StringConstraints(pattern=r'^[0-9]{16}$')]  # 회원카드는 16자리 숫자
+Sid = Annotated[str, StringConstraints(pattern=r'^[0-9]{6}$')]  # 충전소ID는 6자리 숫자
+Cid = Annotated[str, StringConstraints(pattern=r'^[0-9]{2}$')]  # 충전기ID는 2자리 숫자
+DateTime14 = Annotated[str, StringConstraints(pattern=r'^[0-9]{14}$')]  # 날짜는 14자리 숫자 (YYYYMMDDhhmmss)
+OptDateTime14 = Annotated[str, StringConstraints(pattern=r'^([0-9]{14})?$')]  # 빈 값 허용
+Ymd = Annotated[str, StringConstraints(pattern=r'^[0-9]{8}$')]  # 날짜는 8자리 숫자 (YYYYMMDD)
+Spid = Annotated[str, StringConstraints(min_length=3, max_length=3)]  # spid는 3자리
+PageNo = Annotated[int, Field(ge=1)]  # pageno와 pagesize는 1 이상
+Int64 = Annotated[int, Field(gt=-2 ** 63, lt=2 ** 63)]  # 충전량/금액은 int64 범위 (최솟값은 저장소의 빈 값 표시용)
 
 # 공통코드 요청 관련 모델
 class Message(BaseModel):
-    bid: str
-    bkey: str
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
+    bid: Bid
+    bkey: Bkey
+    ver: Optional[str] = None  # 직전에 받은 공통코드 버전, 같으면 목록을 다시 내려주지 않음
+    id: Optional[str] = None  # 코드 구분(예: "BID")만 조회
+    code: Optional[str] = None  # 코드 값만 조회 (id와 함께 주면 한 건)
 
 # 카드 업데이트 모델
 class CardUpdate(BaseModel):
-    no: str
-    stop: str
-
-    @validator('no')
-    def validate_no(cls, v):
-        if len(v) != 16 or not v.isdigit():
-            raise ValueError('회원카드는 16자리 숫자형식입니다.')
-        return v
-
-    @validator('stop')
-    def validate_stop(cls, v):
-        if v not in ('Y', 'N'):
-            raise ValueError('stop 필드는 Y 또는 N이어야 합니다.')
-        return v
+    no: CardNo
+    stop: YN
 
 class CardUpdateRequest(BaseModel):
-    bid: str
-    bkey: str
+    bid: Bid
+    bkey: Bkey
     card: List[CardUpdate]
 
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
 
 
 
 class CardListRequest(BaseModel):
-    bid: str
-    bkey: str
-    kind: str
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('kind')
-    def validate_kind(cls, v):
-        if v not in ['1', '2', '3']:
-            raise ValueError('kind는 "1", "2", "3" 중 하나여야 합니다.')
-        return v
+    bid: Bid
+    bkey: Bkey
+    kind: Kind
+    upddate: Optional[OptDateTime14] = None  # 변경분 조회(kind "2", "3") 기준일시, 없으면 당일 0시
 
 class Card(BaseModel):
     bid: str
@@ -87,232 +54,89 @@ class Card(BaseModel):
     upddate: str
 
 class Trade(BaseModel):
-    no: str
-    sid: str
-    cid: str
+    no: CardNo
+    sid: Sid
+    cid: Cid
     tbid: str
-    tsdt: str
-    tedt: str
-    btid: str = None
-    pow: int
-    mon: int
-    bprice: float = None
-    tbprice: float = None
-    bmon: int = None
-
-    @validator('no')
-    def validate_no(cls, v):
-        if len(v) != 16 or not v.isdigit():
-            raise ValueError('회원카드는 16자리 숫자형식입니다.')
-        return v
-
-    @validator('sid')
-    def validate_sid(cls, v):
-        if len(v) != 6 or not v.isdigit():
-            raise ValueError('충전소ID는 6자리 숫자형식입니다.')
-        return v
-
-    @validator('cid')
-    def validate_cid(cls, v):
-        if len(v) != 2 or not v.isdigit():
-            raise ValueError('충전기ID는 2자리 숫자형식입니다.')
-        return v
-
-    @validator('tsdt', 'tedt')
-    def validate_datetime(cls, v):
-        if len(v) != 14 or not v.isdigit():
-            raise ValueError('날짜는 14자리 숫자형식이어야 합니다.')
-        return v
+    tsdt: DateTime14
+    tedt: DateTime14
+    btid: Optional[str] = None
+    pow: Int64
+    mon: Int64
+    bprice: Optional[float] = None
+    tbprice: Optional[float] = None
+    bmon: Optional[Int64] = None
 
 class TradeRegiRequest(BaseModel):
-    bid: str
+    bid: Bid
     bkey: str
     trade: List[Trade]
 
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
 class Use(BaseModel):
-    sid: str
-    cid: str
+    sid: Sid
+    cid: Cid
     tbid: str
-    tsdt: str
-    tedt: str
-    pow: int
-    mon: int
-    rcvdate: str = None
-
-    @validator('sid')
-    def validate_sid(cls, v):
-        if len(v) != 6 or not v.isdigit():
-            raise ValueError('충전소ID는 6자리 숫자형식입니��.')
-        return v
-
-    @validator('cid')
-    def validate_cid(cls, v):
-        if len(v) != 2 or not v.isdigit():
-            raise ValueError('충전기ID는 2자리 숫자형식입니다.')
-        return v
-
-    @validator('tsdt', 'tedt', 'rcvdate')
-    def validate_datetime(cls, v):
-        if v and (len(v) != 14 or not v.isdigit()):
-            raise ValueError('날짜는 14자리 숫자형식이어야 합니다.')
-        return v
+    tsdt: OptDateTime14
+    tedt: OptDateTime14
+    pow: Int64
+    mon: Int64
+    rcvdate: Optional[OptDateTime14] = None
 
 class UseRegiRequest(BaseModel):
-    bid: str
-    bkey: str
+    bid: Bid
+    bkey: Bkey
     use: List[Use]
 
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
 class TradeListRequest(BaseModel):
-    bid: str
-    bkey: str
-    kind: str
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('kind')
-    def validate_kind(cls, v):
-        if v not in ['1', '2', '3']:
-            raise ValueError('kind는 "1", "2", "3" 중 하나여야 합니다.')
-        return v
+    bid: Bid
+    bkey: Bkey
+    kind: Kind
+    pageno: PageNo = 1
+    pagesize: PageNo = DEFAULT_PAGE_SIZE
+    sdate: Optional[DateTime14] = None  # 충전시작일시(tsdt) 조회 범위 시작 (포함)
+    edate: Optional[DateTime14] = None  # 충전시작일시(tsdt) 조회 범위 끝 (포함)
+    no: Optional[CardNo] = None  # 회원카드번호 조회
+
+class TradeStatRequest(BaseModel):
+    bid: Bid
+    bkey: Bkey
+    group: Literal['sid', 'cid', 'bid'] = 'sid'  # 집계 단위: 충전소, 충전기(sid+cid), 기관
+    sdate: Optional[DateTime14] = None  # 충전시작일시(tsdt) 집계 범위 시작 (포함)
+    edate: Optional[DateTime14] = None  # 충전시작일시(tsdt) 집계 범위 끝 (포함)
 
 class ChargerStatusRequest(BaseModel):
-    bid: str
-    bkey: str
-    kind: str
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('kind')
-    def validate_kind(cls, v):
-        if v not in ['1', '2', '3']:
-            raise ValueError('kind는 "1", "2", "3" 중 하나여야 합니다.')
-        return v
+    bid: Bid
+    bkey: Bkey
+    kind: Kind
 
-class ChargerStatusUpdateRequest(BaseModel):
-    bid: str
-    bkey: str
-    cstat: List[dict]
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('cstat')
-    def validate_cstat(cls, v):
-        for item in v:
-            if 'sid' not in item or len(item['sid']) != 6:
-                raise ValueError('sid는 6자리여야 합니다.')
-            if 'cid' not in item or len(item['cid']) != 2:
-                raise ValueError('cid는 2자리여야 합니다.')
-            if 'status' not in item or item['status'] not in ['0', '1', '2', '3', '4', '5', '6']:
-                raise ValueError('status는 "0", "1", "2", "3", "4", "5", "6" 중 하나여야 합니다.')
-        return v
+class ChargerStat(BaseModel):
+    # 상태 항목의 나머지 필드는 그대로 보관
+    model_config = ConfigDict(extra='allow')
+
+    sid: Annotated[str, StringConstraints(min_length=6, max_length=6)]  # sid는 6자리
+    cid: Annotated[str, StringConstraints(min_length=2, max_length=2)]  # cid는 2자리
+    status: Literal['0', '1', '2', '3', '4', '5', '6']
 
 class ChargerInfoListRequest(BaseModel):
-    bid: str
-    bkey: str
-    kind: str
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('kind')
-    def validate_kind(cls, v):
-        if v not in ['1', '2', '3']:
-            raise ValueError('kind는 "1", "2", "3" 중 하나여야 합니다.')
-        return v
-    
+    bid: Bid
+    bkey: Bkey
+    kind: Kind
+    pageno: PageNo = 1
+    pagesize: PageNo = DEFAULT_PAGE_SIZE
+
 class ChargerStatusUpdateRequest(BaseModel):
-    bid: str
-    bkey: str
-    cstat: List[dict]
-
-    @validator('bid')
-    def validate_bid(cls, v):
-        if len(v) != 2 or v not in ['EV', 'KP']:
-            raise ValueError('bid는 "EV" 또는 "KP"이어야 합니다.')
-        return v
-
-    @validator('bkey')
-    def validate_bkey(cls, v):
-        if len(v) != 16:
-            raise ValueError('bkey는 16자리여야 합니다.')
-        return v
-
-    @validator('cstat')
-    def validate_cstat(cls, v):
-        for item in v:
-            if 'sid' not in item or len(item['sid']) != 6:
-                raise ValueError('sid는 6자리여야 합니다.')
-            if 'cid' not in item or len(item['cid']) != 2:
-                raise ValueError('cid는 2자리여야 합니다.')
-            if 'status' not in item or item['status'] not in ['0', '1', '2', '3', '4', '5', '6']:
-                raise ValueError('status는 "0", "1", "2", "3", "4", "5", "6" 중 하나여야 합니다.')
-        return v
+    bid: Bid
+    bkey: Bkey
+    cstat: List[ChargerStat]
 
 class ChargerQRRequest(BaseModel):
     bid: str
     bkey: str
-    pageno: int
-    pagesize: int
+    pageno: PageNo
+    pagesize: PageNo
 
 class ChargingStationUpdate(BaseModel):
-    spid: str
+    spid: Spid
     csid: str = ""
     csnm: str
     daddr: str
@@ -338,34 +162,24 @@ class ChargingStationUpdate(BaseModel):
     plusdr_yn: str = ""
     me_cs_id: str
 
-    @validator('spid')
-    def validate_spid(cls, v):
-        if len(v) != 3:
-            raise ValueError('spid는 3자리여야 합니다.')
-        return v
-
-class ChargingStationUpdateRequest(BaseModel):
-    spkey: str
-    list: List[ChargingStationUpdate]
-
 class ChargerUpdate(BaseModel):
-    spid: str
+    spid: Spid
     csid: str
-    cpid: str
+    cpid: str = ""  # 신규 충전기는 빈 값 (ID 발급 대상)
     cpnm: str
     use_time: str
-    open_yn: str
-    show_yn: str
+    open_yn: YN
+    show_yn: YN
     spcsid: str = ""
     spcpid: str = ""
     charge_ucost1: str
     charge_ucost2: str = ""
     charge_ucost3: str = ""
-    use_yn: str
-    oper_st_ymd: str
-    oper_end_ymd: str
+    use_yn: YN
+    oper_st_ymd: Ymd
+    oper_end_ymd: Ymd
     outlet_cnt: str
-    pnc_yn: str = "N"
+    pnc_yn: YN = "N"
     cpkw: str
     charge_div: str
     cp_div: str
@@ -379,42 +193,48 @@ class ChargerUpdate(BaseModel):
     auth_div: str
     compty_div: str
     ami_cert: str = ""
-    reserv_yn: str = "N"
+    reserv_yn: YN = "N"
     qrid: str = ""
-    me_cs_id: str
-    me_cp_id: str
-
-    @validator('spid')
-    def validate_spid(cls, v):
-        if len(v) != 3:
-            raise ValueError('spid는 3자리여야 합니다.')
-        return v
-
-    @validator('open_yn', 'show_yn', 'use_yn', 'pnc_yn', 'reserv_yn')
-    def validate_yn_fields(cls, v):
-        if v not in ['Y', 'N']:
-            raise ValueError('Y/N 필드는 "Y" 또는 "N"이어야 합니다.')
-        return v
-
-    @validator('oper_st_ymd', 'oper_end_ymd')
-    def validate_oper_date(cls, v):
-        if len(v) != 8 or not v.isdigit():
-            raise ValueError('날짜는 8자리 숫자형식(YYYYMMDD)이어야 합니다.')
-        return v
-
-    @validator('me_cs_id')
-    def validate_me_cs_id(cls, v):
-        if len(v) != 6 or not v.isdigit():
-            raise ValueError('환경부 충전소ID는 6자리 숫자여야 합니다.')
-        return v
-
-    @validator('me_cp_id')
-    def validate_me_cp_id(cls, v):
-        if len(v) != 2 or not v.isdigit():
-            raise ValueError('환경부 충전기ID는 2자리 숫자여야 합니다.')
-        return v
-
-class ChargerUpdateRequest(BaseModel):
-    spkey: str
-    list: List[ChargerUpdate]
+    me_cs_id: Sid  # 환경부 충전소ID는 6자리 숫자
+    me_cp_id: Cid  # 환경부 충전기ID는 2자리 숫자
+
+class ChargerStatusUpdate(BaseModel):
+    # 상태 값(cp_stat 등) 나머지 필드는 그대로 보관
+    model_config = ConfigDict(extra='allow')
+
+    spid: Spid
+    csid: str
+    cpid: str
+    spcsid: str
+    spcpid: str
+    update_time: DateTime14
+
+class UserInfoUpdate(BaseModel):
+    model_config = ConfigDict(extra='allow')
+
+    spid: Spid
+    cardno: Annotated[str, StringConstraints(min_length=1)]
+
+class StationSearchRequest(BaseModel):
+    # 반경 조회(lat, longi, radius) 또는 지역 조회(sido, sigungu) 중 하나
+    spkey: Optional[str] = None
+    lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    longi: Optional[float] = Field(default=None, ge=-180, le=180)
+    radius: float = Field(default=1.0, gt=0, le=100)  # km
+    sido: Optional[str] = None
+    sigungu: Optional[str] = None
+    open_yn: Optional[YN] = None
+    use_yn: Optional[YN] = None
+    limit: PageNo = 100
+
+    @model_validator(mode='after')
+    def check_condition(self):
+        if (self.lat is None or self.longi is None) and not self.sido:
+            raise ValueError("lat/longi 또는 sido가 필요합니다")
+        return self
+
+class EvapiListRequest(BaseModel):
+    # evapi v200 갱신 요청 공통 형식. list 항목은 핸들러에서 한 건씩 검증해 정상 건만 반영한다.
+    spkey: Optional[str] = None
+    list: List[Any] = []
 
@@ -0,0 +1,124 @@
+# paging.py
+from collections import OrderedDict
+from datetime import datetime
+
+from fixtures import split_list_field
+from responses import encode_json, gzip_body
+from settings import PAGE_CACHE_SIZE
+
+
+class PagedDataset:
+    # 한 리소스의 전체 행을 메모리에 두고 pageno/pagesize로 잘라서 응답한다.
+    # virtual_rows가 실제 행 수보다 크면 원본 행을 순환시켜 가상의 대용량 데이터셋을 만든다.
+    # 데이터셋은 만들어진 뒤 바뀌지 않으므로 페이지별 직렬화/gzip 결과를 캐시해 재사용한다.
+    def __init__(self, key, rows, header=None, virtual_rows=0):
+        self.key = key
+        self.rows = rows
+        self.header = header or {"result": "0"}
+        # rows는 list 또는 슬라이싱을 지원하는 저장소(TradeStore 등). 이후 추가된 행은 보지 않는다.
+        self.size = len(rows)
+        self.total = max(self.size, virtual_rows) if self.size else 0
+        # rdate는 데이터셋 기준시각 (파일 기반이던 때처럼 조회 시각과 무관)
+        self.rdate = datetime.now().strftime('%Y%m%d%H%M%S')
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return self.total
+
+    def page(self, pageno, pagesize):
+        start = (pageno - 1) * pagesize
+        end = min(start + pagesize, self.total)
+        if start >= end:
+            return []
+        size = self.size
+        if end <= size:
+            return self.rows[start:end]
+        return [self.rows[i % size] for i in range(start, end)]
+
+    def content(self, pageno, pagesize):
+        # 페이지 응답 dict (캐시하지 않는 일회성 조회 결과는 이것만 직렬화)
+        rows = self.page(pageno, pagesize)
+        content = dict(self.header)
+        content.update({
+            "totalcnt": self.total,
+            "rowcnt": len(rows),
+            self.key: rows,
+            "rdate": self.rdate,
+            "pageno": pageno,
+        })
+        return content
+
+    def render(self, pageno, pagesize):
+        # (본문, gzip 본문) 반환
+        key = (pageno, pagesize)
+        cached = self._pages.get(key)
+        if cached is not None:
+            self._pages.move_to_end(key)
+            return cached
+
+        body = encode_json(self.content(pageno, pagesize))
+        cached = self._pages[key] = (body, gzip_body(body))
+        if len(self._pages) > PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return cached
+
+
+class StoreDataset:
+    # 추가만 되는 저장소(TradeStore 등)를 페이지 단위로 응답한다.
+    # 저장소 version이 바뀌면 다음 조회 시 새 스냅샷(PagedDataset)을 만든다.
+    def __init__(self, store, key, header=None, virtual_rows=0):
+        self.store = store
+        self.key = key
+        self.header = header or {"result": "0"}
+        self.virtual_rows = virtual_rows
+        self._version = None
+        self._dataset = None
+
+    def get(self):
+        if self.store.version != self._version:
+            self._dataset = PagedDataset(self.key, self.store, self.header, self.virtual_rows)
+            self._version = self.store.version
+        return self._dataset
+
+
+class FixtureDataset:
+    # 페이지별로 나뉜 응답 파일들을 하나의 PagedDataset으로 합친다.
+    # 원본 파일의 mtime이 바뀌면 다음 조회 시 다시 합친다.
+    def __init__(self, cache, file_names, virtual_rows=0):
+        self.cache = cache
+        self.file_names = file_names
+        self.virtual_rows = virtual_rows
+        self._signature = None
+        self._dataset = None
+
+    def get(self):
+        entries = []
+        for name in self.file_names:
+            try:
+                entries.append(self.cache.get(name))
+            except FileNotFoundError:
+                continue
+        if not entries:
+            raise FileNotFoundError(", ".join(self.file_names))
+
+        signature = tuple((entry.name, entry.mtime) for entry in entries)
+        if signature != self._signature:
+            self._dataset = self._build(entries)
+            self._signature = signature
+        return self._dataset
+
+    def _build(self, entries):
+        key = None
+        header = {}
+        rows = []
+        for entry in entries:
+            # 파일마다 목록 필드(trade, cinfo 등) 하나를 가지고 있다고 가정
+            list_key, list_rows, file_header = split_list_field(entry.data)
+            key = key or list_key
+            rows.extend(list_rows)
+            if not header:
+                header = {
+                    k: v for k, v in file_header.items()
+                    if k not in ("totalcnt", "rowcnt", "rdate", "pageno")
+                }
+        return PagedDataset(key, rows, header, self.virtual_rows)
@@ -0,0 +1,66 @@
+# request_log.py
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+from pydantic import BaseModel
+
+from settings import LOG_FULL_SAMPLE_RATE, LOG_MAX_CHARS
+
+
+class DeferredQueueHandler(QueueHandler):
+    # 기본 QueueHandler는 큐에 넣기 전에 메시지를 포맷한다.
+    # 여기서는 레코드를 그대로 넣어 포맷(요약/repr 생성)까지 백그라운드 스레드에서 처리한다.
+    def prepare(self, record):
+        return record
+
+
+def start_queue_logging(level=logging.INFO):
+    # 루트 로거의 기존 핸들러를 백그라운드 리스너로 옮기고, 루트에는 큐 핸들러만 남긴다
+    logging.basicConfig(level=level)
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [DeferredQueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def summarize(obj, limit=LOG_MAX_CHARS):
+    # 목록 필드는 건수만, 나머지 필드는 값을 남긴다
+    if isinstance(obj, BaseModel):
+        name, fields = type(obj).__name__, obj.__dict__
+    elif isinstance(obj, dict):
+        name, fields = "dict", obj
+    else:
+        return _truncate(repr(obj), limit)
+
+    parts = []
+    for key, value in fields.items():
+        if isinstance(value, (list, tuple, dict)):
+            parts.append(f"{key}=<{len(value)} items>")
+        else:
+            parts.append(f"{key}={value!r}")
+    return _truncate(f"{name}({', '.join(parts)})", limit)
+
+
+def _truncate(text, limit):
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text)} chars)"
+
+
+class Payload:
+    # 로그 인자로 넘기면 리스너 스레드에서 문자열로 변환된다.
+    # LOG_FULL_SAMPLE_RATE 비율로 샘플링된 경우에만 전체 내용을 남긴다.
+    __slots__ = ("obj", "full")
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.full = LOG_FULL_SAMPLE_RATE > 0 and random.random() < LOG_FULL_SAMPLE_RATE
+
+    def __str__(self):
+        if self.full:
+            return repr(self.obj)
+        return summarize(self.obj)
@@ -0,0 +1,114 @@
+# responses.py
+import gzip
+import json
+
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from settings import STREAM_CHUNK_ROWS, GZIP_MIN_SIZE, GZIP_LEVEL
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_json(content):
+    # orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 JSONResponse와 같은 형식
+    # (ensure_ascii=False, 공백 없음)으로 직렬화
+    if orjson is not None:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson이 못 다루는 값(64비트 범위를 넘는 정수 등)은 표준 json으로
+            pass
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content):
+        return encode_json(content)
+
+
+def gzip_body(body):
+    # 캐시해 둘 응답의 gzip 본문. 작은 응답은 압축하지 않는다 (None)
+    if len(body) < GZIP_MIN_SIZE:
+        return None
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _qvalue(params):
+    # Accept-Encoding 항목의 q 값. 없으면 1, 해석할 수 없으면 0 (받지 않는 것으로 본다)
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                q = float(value.strip())
+            except ValueError:
+                return 0.0
+            return q if 0 <= q <= 1 else 0.0
+    return 1.0
+
+
+def accepts_gzip(accept_encoding):
+    # gzip 항목이 있으면 그 q 값을, 없으면 * 항목의 q 값을 따른다
+    qvalues = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if coding in ("gzip", "*"):
+            qvalues.setdefault(coding, _qvalue(params))
+    q = qvalues.get("gzip", qvalues.get("*", 0.0))
+    return q > 0
+
+
+def cached_json_response(body, gzipped, accept_encoding, headers=None):
+    # 미리 압축해 둔 본문이 있고 클라이언트가 gzip을 받으면 압축본을 그대로 응답
+    headers = dict(headers or {})
+    if gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(accept_encoding):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=gzipped, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def json_response(body, accept_encoding):
+    # 요청마다 달라져 캐시하지 않는 본문은 클라이언트가 gzip을 받을 때만 압축
+    gzipped = gzip_body(body) if accepts_gzip(accept_encoding) else None
+    headers = {"Vary": "Accept-Encoding"} if len(body) >= GZIP_MIN_SIZE else None
+    return cached_json_response(body, gzipped, accept_encoding, headers)
+
+
+def iter_json_list(header, key, rows, chunk_size=STREAM_CHUNK_ROWS):
+    # {"result":..., "trade":[ 까지 먼저 내보내고, 목록은 chunk_size 행씩 직렬화해 이어 붙인다
+    head = encode_json(header)[:-1]
+    if header:
+        head += b","
+    yield head + encode_json(key) + b":["
+
+    chunk = []
+    first = True
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            # 묶음 전체를 배열로 한 번에 직렬화한 뒤 대괄호만 떼어 낸다
+            yield (b"" if first else b",") + encode_json(chunk)[1:-1]
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + encode_json(chunk)[1:-1]
+
+    yield b"]}"
+
+
+def streaming_json_list(header, key, rows, chunk_size=STREAM_CHUNK_ROWS):
+    return StreamingResponse(
+        iter_json_list(header, key, rows, chunk_size),
+        media_type="application/json",
+    )
@@ -0,0 +1,73 @@
+# settings.py
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# 페이지 조회 기본 건수 (요청에 pagesize가 없을 때)
+DEFAULT_PAGE_SIZE = _env_int("KECO_DEFAULT_PAGE_SIZE", 5000)
+
+# 페이징 데이터셋의 가상 행 수. 0이면 파일 행 수 그대로,
+# 그보다 크면 원본 행을 반복해 해당 건수로 늘린다 (대용량 페이징 부하 테스트용)
+PAGING_VIRTUAL_ROWS = _env_int("KECO_PAGING_VIRTUAL_ROWS", 0)
+
+# 스트리밍 응답에서 한 번에 직렬화해 내보내는 행 수
+STREAM_CHUNK_ROWS = _env_int("KECO_STREAM_CHUNK_ROWS", 500)
+
+# 충전이력/사용이력 중복 검사 보관 기간(일). 0이면 기간 제한 없이 모두 보관
+DEDUP_WINDOW_DAYS = _env_int("KECO_DEDUP_WINDOW_DAYS", 0)
+
+# 요청/응답 로그: 기본은 요약(건수, 키)만 남기고 LOG_FULL_SAMPLE_RATE 비율만큼 전체 내용을 남긴다
+LOG_FULL_SAMPLE_RATE = _env_float("KECO_LOG_FULL_SAMPLE_RATE", 0.0)
+# 요약 로그 한 건의 최대 길이
+LOG_MAX_CHARS = _env_int("KECO_LOG_MAX_CHARS", 1000)
+
+# 요청 캡처: KECO_CAPTURE=1 이면 들어온 요청을 CAPTURE_FILE(JSON Lines)에 기록 (benchmarks/replay.py로 재현)
+CAPTURE_ENABLED = os.environ.get("KECO_CAPTURE", "") == "1"
+CAPTURE_FILE = os.environ.get("KECO_CAPTURE_FILE", "requests.jsonl")
+# 캡처할 요청 본문 최대 크기(바이트). 넘는 본문(대량 등록 등)은 크기만 기록하고 재현하지 않음
+CAPTURE_MAX_BODY = _env_int("KECO_CAPTURE_MAX_BODY", 1024 * 1024)
+
+# gzip 압축: 이 크기(bytes) 이상인 캐시 응답은 로딩 시 미리 압축해 둔다
+GZIP_MIN_SIZE = _env_int("KECO_GZIP_MIN_SIZE", 1024)
+GZIP_LEVEL = _env_int("KECO_GZIP_LEVEL", 6)
+# 동적 응답의 즉시 압축 기준 크기(bytes). 0이면 사용하지 않음
+GZIP_DYNAMIC_MIN_SIZE = _env_int("KECO_GZIP_DYNAMIC_MIN_SIZE", 0)
+# 페이지 응답(직렬화/압축 결과) 캐시 개수
+PAGE_CACHE_SIZE = _env_int("KECO_PAGE_CACHE_SIZE", 32)
+
+# NDJSON 대량 등록: 한 번에 검증/저장하는 행 수와 응답 errlist 최대 건수
+BULK_CHUNK_ROWS = _env_int("KECO_BULK_CHUNK_ROWS", 1000)
+BULK_ERRLIST_MAX = _env_int("KECO_BULK_ERRLIST_MAX", 1000)
+# 대량 등록 NDJSON 한 줄의 최대 크기(바이트). 넘는 줄은 읽지 않고 오류로 보고
+BULK_MAX_LINE = _env_int("KECO_BULK_MAX_LINE", 64 * 1024)
+
+# 저장소: "memory"(기본, 재시작 시 초기화) 또는 "sqlite"(SQLITE_PATH 파일에 WAL 모드로 보관)
+STORAGE_BACKEND = os.environ.get("KECO_STORAGE", "memory")
+SQLITE_PATH = os.environ.get("KECO_SQLITE_PATH", "keco.db")
+
+# write-behind: 1이면 저장소 기록을 요청과 분리해 백그라운드에서 모아서 기록 (sqlite 저장소일 때)
+WRITE_BEHIND_ENABLED = os.environ.get("KECO_WRITE_BEHIND", "0") == "1"
+# 대기 중인 기록(요청 단위) 최대 개수. 가득 차면 등록 요청에 503(재시도)으로 응답
+WRITE_BEHIND_QUEUE_SIZE = _env_int("KECO_WRITE_BEHIND_QUEUE_SIZE", 1000)
+# 한 트랜잭션으로 모으는 최대 행 수와 최대 대기 시간(초)
+WRITE_BEHIND_MAX_ROWS = _env_int("KECO_WRITE_BEHIND_MAX_ROWS", 20000)
+WRITE_BEHIND_INTERVAL = _env_float("KECO_WRITE_BEHIND_INTERVAL", 0.2)
+# 기록 실패 시 재시도 횟수(간격은 INTERVAL부터 두 배씩). 모두 실패한 배치를 남길 JSON Lines 파일 (비어 있으면 남기지 않음)
+WRITE_BEHIND_RETRIES = _env_int("KECO_WRITE_BEHIND_RETRIES", 5)
+WRITE_BEHIND_SPILL_FILE = os.environ.get("KECO_WRITE_BEHIND_SPILL_FILE", "")
+
+# 충전소 위치 색인 격자 크기(도). 0.01도는 약 1km
+GEO_CELL_DEG = _env_float("KECO_GEO_CELL_DEG", 0.01)
+
+# 충전소/충전기 ID 발급 기록(JSON Lines) 디렉터리 (기본: 현재 디렉터리). 재시작해도 이미 발급한 ID를 다시 내주지 않도록
+# 저장소 설정과 관계없이 기록한다. 빈 값으로 지정하면 기록하지 않음 (재시작 시 순번이 처음부터 시작)
+ID_JOURNAL_DIR = os.environ.get("KECO_ID_JOURNAL_DIR", ".")
@@ -0,0 +1,113 @@
+# station_store.py
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _coord(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    # 하버사인 거리
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StationStore:
+    # 등록된 충전소(csid 키)를 위경도 격자(cell_deg 크기 칸)와 시도/시군구별로 색인한다.
+    # 반경 조회는 원을 덮는 칸들만 훑고 거리로 거르므로 전체 충전소 수와 무관하게 주변 건수에 비례한다.
+    def __init__(self, cell_deg=0.01):
+        self.cell_deg = cell_deg
+        self._stations = {}
+        self._positions = {}
+        self._cells = {}
+        self._regions = {}
+
+    def __len__(self):
+        return len(self._stations)
+
+    def get(self, csid):
+        return self._stations.get(csid)
+
+    def put(self, station):
+        csid = station["csid"]
+        old = self._stations.get(csid)
+        if old is not None:
+            self._unindex(old)
+        self._stations[csid] = station
+        lat, lon = _coord(station.get("lat")), _coord(station.get("longi"))
+        # 좌표가 없거나 잘못된 충전소는 지역 조회에만 나온다
+        if lat is not None and lon is not None:
+            self._positions[csid] = (lat, lon)
+            self._cells.setdefault(self._cell(lat, lon), set()).add(csid)
+        for region in self._region_keys(station):
+            self._regions.setdefault(region, set()).add(csid)
+
+    def _unindex(self, station):
+        position = self._positions.pop(station["csid"], None)
+        if position is not None:
+            cell = self._cell(*position)
+            self._cells[cell].discard(station["csid"])
+            if not self._cells[cell]:
+                del self._cells[cell]
+        for region in self._region_keys(station):
+            self._regions[region].discard(station["csid"])
+            if not self._regions[region]:
+                del self._regions[region]
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg)
+
+    @staticmethod
+    def _region_keys(station):
+        sido, sigungu = station.get("sido") or "", station.get("sigungu") or ""
+        return [(sido, None), (sido, sigungu)] if sido else []
+
+    @staticmethod
+    def _matches(station, filters):
+        return all(station.get(field) == value for field, value in filters.items())
+
+    def nearby(self, lat, lon, radius_km, limit=None, **filters):
+        # (lat, lon)에서 radius_km 이내 충전소를 가까운 순으로 [(거리 km, 충전소)] 반환
+        filters = {field: value for field, value in filters.items() if value is not None}
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        (lat_lo, lon_lo), (lat_hi, lon_hi) = self._cell(lat - dlat, lon - dlon), self._cell(lat + dlat, lon + dlon)
+
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(self._cells):
+            # 반경이 커서 훑을 칸이 채워진 칸보다 많으면 채워진 칸만 확인
+            cells = [cell for cell in self._cells
+                     if lat_lo <= cell[0] <= lat_hi and lon_lo <= cell[1] <= lon_hi]
+        else:
+            cells = [(ilat, ilon) for ilat in range(lat_lo, lat_hi + 1) for ilon in range(lon_lo, lon_hi + 1)]
+
+        found = []
+        for cell in cells:
+            for csid in self._cells.get(cell, ()):
+                station = self._stations[csid]
+                dist = distance_km(lat, lon, *self._positions[csid])
+                if dist <= radius_km and self._matches(station, filters):
+                    found.append((dist, station))
+        found.sort(key=lambda item: item[0])
+        return found[:limit] if limit else found
+
+    def in_region(self, sido, sigungu=None, limit=None, **filters):
+        # 시도(+시군구) 충전소를 csid 순으로 반환
+        filters = {field: value for field, value in filters.items() if value is not None}
+        csids = sorted(self._regions.get((sido, sigungu), ()))
+        result = []
+        for csid in csids:
+            station = self._stations[csid]
+            if self._matches(station, filters):
+                result.append(station)
+                if limit and len(result) >= limit:
+                    break
+        return result
@@ -0,0 +1,82 @@
+# status_store.py
+from starlette.concurrency import run_in_threadpool
+
+from responses import encode_json
+
+
+class StatusStore:
+    # 충전기별 최신 상태 테이블 ((sid, cid) 또는 (csid, cpid) 키).
+    # 갱신은 이벤트 루프에서 await 없이 dict만 바꾸므로 쓰기끼리 서로 막지 않는다.
+    # 목록 조회는 스냅샷을 떠서 스레드풀에서 직렬화하고, 변경이 없으면 직전 결과(bytes)를 재사용한다.
+    def __init__(self, key_fields, list_key):
+        self.key_fields = key_fields
+        self.list_key = list_key
+        self.header = {"result": "0"}
+        self._rows = {}
+        self._version = 0
+        self._cached_version = -1
+        self._cached_rows = None
+        self._cached_count = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def key(self, item):
+        return tuple(item[field] for field in self.key_fields)
+
+    def load(self, rows, header=None):
+        if header:
+            self.header = {k: v for k, v in header.items() if k not in ("rowcnt", "rdate")}
+        for row in rows:
+            self._rows[self.key(row)] = dict(row)
+        self._version += 1
+
+    def update(self, items, status_field="status"):
+        # 새로 등록됐거나 상태가 바뀐 건수를 반환
+        changed = 0
+        for item in items:
+            key = self.key(item)
+            old = self._rows.get(key)
+            if old is None or old.get(status_field) != item.get(status_field):
+                changed += 1
+            self._rows[key] = item
+        if items:
+            self._version += 1
+        return changed
+
+    def update_latest(self, items, version_field):
+        # 같은 충전기에 대한 여러 건은 version_field(갱신시각)가 가장 최신인 1건으로 합치고,
+        # 이미 저장된 갱신시각보다 오래되었거나 같은 건은 반영하지 않는다.
+        # 실제 반영된 항목의 위치(items 기준 인덱스)를 반환
+        latest = {}
+        for i, item in enumerate(items):
+            key = self.key(item)
+            current = latest.get(key)
+            if current is None or item[version_field] >= items[current][version_field]:
+                latest[key] = i
+
+        applied = []
+        for key, i in latest.items():
+            old = self._rows.get(key)
+            if old is not None and old[version_field] >= items[i][version_field]:
+                continue
+            self._rows[key] = items[i]
+            applied.append(i)
+        if applied:
+            self._version += 1
+        applied.sort()
+        return applied
+
+    async def render(self, rdate):
+        if self._cached_version != self._version:
+            version = self._version
+            rows = list(self._rows.values())
+            self._cached_rows = await run_in_threadpool(
+                lambda: b",".join(encode_json(row) for row in rows)
+            )
+            self._cached_version = version
+            self._cached_count = len(rows)
+
+        header = dict(self.header)
+        header.update({"rowcnt": self._cached_count, "rdate": rdate})
+        return encode_json(header)[:-1] + b"," + encode_json(self.list_key) + b":[" + self._cached_rows + b"]}"
@@ -0,0 +1,189 @@
+# storage.py
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+TRADE_COLUMNS = ("tseq", "bid", "no", "sid", "cid", "tbid", "tsdt", "tedt", "btid", "pow", "mon",
+                 "bprice", "tbprice", "bmon", "regdate")
+USE_COLUMNS = ("sid", "cid", "tsdt", "bid", "tbid", "tedt", "pow", "mon", "rcvdate", "regdate")
+
+# 테이블/인덱스는 목록·조회 엔드포인트의 조회 조건에 맞춘다.
+# stations/chargers의 사업자 ID(spcsid/spcpid)는 빈 값일 수 있어 유일 제약을 두지 않는다 (ID 발급은 IdAllocator가 보장)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    no TEXT PRIMARY KEY, bid TEXT, stop TEXT, regdate TEXT, upddate TEXT
+);
+CREATE INDEX IF NOT EXISTS cards_upddate ON cards (upddate);
+
+CREATE TABLE IF NOT EXISTS trades (
+    tseq INTEGER PRIMARY KEY, bid TEXT, no TEXT, sid TEXT, cid TEXT, tbid TEXT, tsdt TEXT, tedt TEXT,
+    btid TEXT, pow INTEGER, mon TEXT, bprice TEXT, tbprice TEXT, bmon TEXT, regdate TEXT,
+    UNIQUE (no, sid, cid, tsdt)
+);
+CREATE INDEX IF NOT EXISTS trades_tsdt ON trades (tsdt);
+CREATE INDEX IF NOT EXISTS trades_no_tsdt ON trades (no, tsdt);
+
+CREATE TABLE IF NOT EXISTS uses (
+    sid TEXT, cid TEXT, tsdt TEXT, bid TEXT, tbid TEXT, tedt TEXT, pow INTEGER, mon INTEGER,
+    rcvdate TEXT, regdate TEXT
+);
+-- tsdt가 빈 사용이력은 자연키가 없으므로 유일 제약에서 뺀다
+CREATE UNIQUE INDEX IF NOT EXISTS uses_key ON uses (sid, cid, tsdt) WHERE tsdt <> '';
+
+CREATE TABLE IF NOT EXISTS charger_status (
+    sid TEXT, cid TEXT, status TEXT, data TEXT,
+    PRIMARY KEY (sid, cid)
+);
+
+CREATE TABLE IF NOT EXISTS cp_status (
+    csid TEXT, cpid TEXT, update_time TEXT, data TEXT,
+    PRIMARY KEY (csid, cpid)
+);
+
+CREATE TABLE IF NOT EXISTS stations (
+    csid TEXT PRIMARY KEY, spid TEXT, spcsid TEXT, sido TEXT, sigungu TEXT, lat TEXT, longi TEXT,
+    open_yn TEXT, use_yn TEXT, data TEXT
+);
+CREATE INDEX IF NOT EXISTS stations_region ON stations (sido, sigungu);
+
+CREATE TABLE IF NOT EXISTS chargers (
+    cpid TEXT PRIMARY KEY, spid TEXT, csid TEXT, spcpid TEXT, data TEXT
+);
+"""
+
+UPSERT_CARD = """
+INSERT INTO cards (no, bid, stop, regdate, upddate) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (no) DO UPDATE SET stop = excluded.stop, upddate = excluded.upddate
+"""
+INSERT_TRADE = f"""
+INSERT OR IGNORE INTO trades ({", ".join(TRADE_COLUMNS)}) VALUES ({", ".join("?" * len(TRADE_COLUMNS))})
+"""
+INSERT_USE = f"""
+INSERT OR IGNORE INTO uses ({", ".join(USE_COLUMNS)}) VALUES ({", ".join("?" * len(USE_COLUMNS))})
+"""
+UPSERT_CHARGER_STATUS = """
+INSERT INTO charger_status (sid, cid, status, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (sid, cid) DO UPDATE SET status = excluded.status, data = excluded.data
+"""
+UPSERT_CP_STATUS = """
+INSERT INTO cp_status (csid, cpid, update_time, data) VALUES (?, ?, ?, ?)
+ON CONFLICT (csid, cpid) DO UPDATE SET update_time = excluded.update_time, data = excluded.data
+WHERE excluded.update_time > cp_status.update_time
+"""
+UPSERT_STATION = """
+INSERT INTO stations (csid, spid, spcsid, sido, sigungu, lat, longi, open_yn, use_yn, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (csid) DO UPDATE SET sido = excluded.sido, sigungu = excluded.sigungu, lat = excluded.lat,
+    longi = excluded.longi, open_yn = excluded.open_yn, use_yn = excluded.use_yn, data = excluded.data
+"""
+UPSERT_CHARGER = """
+INSERT INTO chargers (cpid, spid, csid, spcpid, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (cpid) DO UPDATE SET data = excluded.data
+"""
+
+
+def _dumps(row):
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+
+class SqliteStorage:
+    # 등록/갱신 데이터를 SQLite(WAL) 파일에 보관한다. 조회는 메모리 저장소가 맡고,
+    # 이 저장소는 요청마다 executemany 한 번(트랜잭션 하나)으로 쓰고 시작 시 메모리 저장소를 다시 채우는 데 쓴다.
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+        self._in_transaction = False
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL: 쓰기가 읽기를 막지 않고, synchronous=NORMAL이면 커밋마다 fsync하지 않는다
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        logger.info(f"SQLite storage opened: {self.path}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @contextmanager
+    def transaction(self):
+        # 안에서 호출한 save_* 를 모두 한 트랜잭션으로 묶는다 (write-behind 배치 기록용)
+        with self._lock, self._conn:
+            self._in_transaction = True
+            try:
+                yield
+            finally:
+                self._in_transaction = False
+
+    def _write(self, sql, params):
+        params = list(params)
+        if not params:
+            return
+        with self._lock:
+            if self._in_transaction:
+                self._conn.executemany(sql, params)
+                return
+            with self._conn:
+                self._conn.executemany(sql, params)
+
+    def _read(self, sql):
+        with self._lock:
+            return self._conn.execute(sql).fetchall()
+
+    # 쓰기 (요청 한 건 = 트랜잭션 하나)
+    def save_cards(self, cards):
+        self._write(UPSERT_CARD, (
+            (card["no"], card["bid"], card["stop"], card["regdate"], card["upddate"]) for card in cards))
+
+    def save_trades(self, rows):
+        self._write(INSERT_TRADE, (tuple(row.get(column) for column in TRADE_COLUMNS) for row in rows))
+
+    def save_uses(self, rows):
+        self._write(INSERT_USE, (tuple(row.get(column) for column in USE_COLUMNS) for row in rows))
+
+    def save_charger_status(self, rows):
+        self._write(UPSERT_CHARGER_STATUS, (
+            (row["sid"], row["cid"], row.get("status"), _dumps(row)) for row in rows))
+
+    def save_cp_status(self, rows):
+        self._write(UPSERT_CP_STATUS, (
+            (row["csid"], row["cpid"], row["update_time"], _dumps(row)) for row in rows))
+
+    def save_stations(self, stations):
+        self._write(UPSERT_STATION, (
+            (s["csid"], s["spid"], s["spcsid"], s.get("sido"), s.get("sigungu"), s.get("lat"), s.get("longi"),
+             s.get("open_yn"), s.get("use_yn"), _dumps(s)) for s in stations))
+
+    def save_chargers(self, chargers):
+        self._write(UPSERT_CHARGER, (
+            (c["cpid"], c["spid"], c["csid"], c["spcpid"], _dumps(c)) for c in chargers))
+
+    # 읽기 (시작 시 메모리 저장소 초기화용)
+    def load_cards(self):
+        return [dict(row) for row in self._read("SELECT bid, no, stop, regdate, upddate FROM cards ORDER BY upddate")]
+
+    def load_trades(self):
+        return [dict(row) for row in self._read(f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades ORDER BY tseq")]
+
+    def load_use_keys(self):
+        return [tuple(row) for row in self._read("SELECT sid, cid, tsdt FROM uses WHERE tsdt <> ''")]
+
+    def load_charger_status(self):
+        return [json.loads(row["data"]) for row in self._read("SELECT data FROM charger_status")]
+
+    def load_cp_status(self):
+        return [json.loads(row["data"]) for row in self._read("SELECT data FROM cp_status")]
+
+    def load_stations(self):
+        return [json.loads(row["data"]) for row in self._read("SELECT data FROM stations")]
+
+    def load_chargers(self):
+        return [json.loads(row["data"]) for row in self._read("SELECT data FROM chargers")]
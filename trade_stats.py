@@ -0,0 +1,114 @@
+# trade_stats.py
+from trade_store import MISSING
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 집계 단위: sid(충전소), cid(충전소+충전기), bid(기관)
+GROUP_FIELDS = {
+    "sid": ("sid",),
+    "cid": ("sid", "cid"),
+    "bid": ("bid",),
+}
+
+
+def _price(value):
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _group_codes(store, group):
+    # 그룹별 정수 코드 계산에 쓸 (컬럼, 그룹 수). (sid, cid)는 sid 코드 * cid 종류 수 + cid 코드
+    if group == "cid":
+        return store.sid.codes, store.cid.codes, len(store.cid.values)
+    column = store.sid if group == "sid" else store.bid
+    return column.codes, None, 1
+
+
+def _labels(store, group, code):
+    if group == "cid":
+        ncid = len(store.cid.values)
+        return {"sid": store.sid.values[code // ncid], "cid": store.cid.values[code % ncid]}
+    column = store.sid if group == "sid" else store.bid
+    return {group: column.values[code]}
+
+
+def aggregate(store, group="sid", rows=None):
+    # 충전이력을 그룹별로 건수/충전량(pow)/금액(mon) 합계와 평균 단가(bprice)로 집계.
+    # rows(행 번호 배열)가 있으면 그 행만 집계한다. numpy가 있으면 컬럼 배열을 복사 없이 벡터 연산.
+    if not len(store):
+        return []
+    prices = [_price(value) for value in store.bprice.values]
+    if np is not None:
+        totals = _aggregate_numpy(store, group, rows, prices)
+    else:
+        totals = _aggregate_python(store, group, rows, prices)
+
+    result = []
+    for code, cnt, pow, mon, price_sum, price_cnt in totals:
+        item = _labels(store, group, code)
+        item.update({
+            "cnt": cnt,
+            "pow": pow,
+            "mon": mon,
+            "avgbprice": round(price_sum / price_cnt, 2) if price_cnt else None,
+        })
+        result.append(item)
+    result.sort(key=lambda item: tuple(item[field] for field in GROUP_FIELDS[group]))
+    return result
+
+
+def _aggregate_numpy(store, group, rows, prices):
+    major, minor, width = _group_codes(store, group)
+    codes = np.frombuffer(major, dtype=major.typecode).astype(np.int64)
+    if minor is not None:
+        codes = codes * width + np.frombuffer(minor, dtype=minor.typecode)
+    pow = np.frombuffer(store.pow, dtype=np.int64)
+    mon = np.frombuffer(store.mon, dtype=np.int64)
+    price = np.array([np.nan if p is None else p for p in prices])[
+        np.frombuffer(store.bprice.codes, dtype=store.bprice.codes.typecode)]
+    if rows is not None:
+        index = np.frombuffer(rows, dtype=np.int64) if len(rows) else np.zeros(0, dtype=np.int64)
+        codes, pow, mon, price = codes[index], pow[index], mon[index], price[index]
+
+    size = int(codes.max()) + 1 if len(codes) else 0
+    has_price = ~np.isnan(price)
+    cnt = np.bincount(codes, minlength=size)
+    # 합계는 정수 그대로 (float 가중치로 더하면 큰 값에서 오차가 생길 수 있음)
+    pow_sum = np.zeros(size, dtype=np.int64)
+    mon_sum = np.zeros(size, dtype=np.int64)
+    np.add.at(pow_sum, codes, np.where(pow == MISSING, 0, pow))
+    np.add.at(mon_sum, codes, np.where(mon == MISSING, 0, mon))
+    price_sum = np.bincount(codes, weights=np.where(has_price, price, 0.0), minlength=size)
+    price_cnt = np.bincount(codes, weights=has_price, minlength=size)
+
+    return [
+        (code, int(cnt[code]), int(pow_sum[code]), int(mon_sum[code]), float(price_sum[code]), int(price_cnt[code]))
+        for code in np.flatnonzero(cnt).tolist()
+    ]
+
+
+def _aggregate_python(store, group, rows, prices):
+    major, minor, width = _group_codes(store, group)
+    rows = range(len(store)) if rows is None else rows
+    pow_column, mon_column, price_codes = store.pow, store.mon, store.bprice.codes
+    totals = {}
+    for i in rows:
+        code = major[i] * width + minor[i] if minor is not None else major[i]
+        total = totals.get(code)
+        if total is None:
+            total = totals[code] = [0, 0, 0, 0.0, 0]
+        total[0] += 1
+        if pow_column[i] != MISSING:
+            total[1] += pow_column[i]
+        if mon_column[i] != MISSING:
+            total[2] += mon_column[i]
+        price = prices[price_codes[i]]
+        if price is not None:
+            total[3] += price
+            total[4] += 1
+    return [(code, *total) for code, total in totals.items()]
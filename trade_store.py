@@ -0,0 +1,258 @@
+# trade_store.py
+from array import array
+from bisect import bisect_left, bisect_right
+
+# 빈 값("")을 나타내는 정수 컬럼 값
+MISSING = -(2 ** 63)
+
+# 응답(trade 목록)에 내려가는 필드 순서
+FIELDS = ("bid", "no", "sid", "cid", "tbid", "tsdt", "tedt", "btid", "pow", "mon",
+          "bprice", "tbprice", "bmon", "regdate", "tseq")
+
+
+class CodeColumn:
+    # 종류가 적은 문자열 컬럼. 값은 한 번만 보관하고 행마다 정수 코드만 배열에 쌓는다.
+    def __init__(self, typecode):
+        self.values = []
+        self.codes = array(typecode)
+        self._index = {}
+
+    def code(self, value):
+        # 값의 코드 (처음 보는 값이면 새로 등록). 코드 배열 범위를 넘으면 아무것도 바꾸지 않고 OverflowError
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            array(self.codes.typecode, (code,))
+            self._index[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.code(value))
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+
+class SortedIndex:
+    # 정수 키 순으로 정렬된 (키, 행 번호) 배열 쌍. 범위 조회는 이진 탐색 후 슬라이스.
+    # 새 행은 배치 단위로 정렬해 한 번에 병합하므로 배치당 비용은 배열 복사 한 번(O(n))이다.
+    def __init__(self):
+        self.keys = array("q")
+        self.rows = array("q")
+
+    def merge(self, pairs):
+        # (키, 행 번호) 목록을 정렬해 기존 배열과 병합. 기존 구간은 슬라이스로 통째로 복사한다.
+        if not pairs:
+            return
+        keys, rows = array("q"), array("q")
+        start = 0
+        for key, row in sorted(pairs):
+            pos = bisect_right(self.keys, key, start)
+            keys += self.keys[start:pos]
+            rows += self.rows[start:pos]
+            keys.append(key)
+            rows.append(row)
+            start = pos
+        keys += self.keys[start:]
+        rows += self.rows[start:]
+        self.keys, self.rows = keys, rows
+
+    def rebuild(self, column):
+        order = sorted(range(len(column)), key=column.__getitem__)
+        self.keys = array("q", (column[i] for i in order))
+        self.rows = array("q", order)
+
+    def range(self, low=None, high=None):
+        # low 이상 high 이하 키의 행 번호 (키 순)
+        start = 0 if low is None else bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect_right(self.keys, high)
+        return self.rows[start:end]
+
+
+def _int(value):
+    if value is None or value == "":
+        return MISSING
+    value = int(value)
+    if not MISSING < value < 2 ** 63:
+        raise OverflowError(f"value out of int64 range: {value}")
+    return value
+
+
+def _str(value):
+    return "" if value == MISSING else str(value)
+
+
+def _ts(value):
+    return "" if value == MISSING else f"{value:014d}"
+
+
+def _price(value):
+    # 요청 모델(float)로 들어온 단가를 목록 응답 형식(문자열)으로
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class TradeStore:
+    # 충전이력을 행(dict) 대신 컬럼별 배열로 보관하는 저장소 (추가만 가능).
+    # 카드번호/일시/금액은 int64 배열, sid/cid/bid처럼 종류가 적은 값은 CodeColumn으로 압축하고,
+    # dict는 응답을 직렬화할 때 필요한 행만 만든다.
+    def __init__(self):
+        self.no = array("q")
+        self.tsdt = array("q")
+        self.tedt = array("q")
+        self.regdate = array("q")
+        self.pow = array("q")
+        self.mon = array("q")
+        self.bmon = array("q")
+        self.tseq = array("q")
+        self.bid = CodeColumn("H")
+        # tbid는 클라이언트가 보내는 자유 문자열이라 32비트 코드
+        self.tbid = CodeColumn("I")
+        # sid는 영문이 섞인 값(예: 19D104)도 있어 숫자 대신 코드로 저장
+        self.sid = CodeColumn("i")
+        self.cid = CodeColumn("H")
+        # 단가는 클라이언트가 보내는 실수라 종류가 많을 수 있어 32비트 코드
+        self.bprice = CodeColumn("I")
+        self.tbprice = CodeColumn("I")
+        # btid는 대부분 서로 다른 값이라 그대로 보관
+        self.btid = []
+        # 조회용 정렬 인덱스 (충전시작일시, 회원카드번호)
+        self.tsdt_index = SortedIndex()
+        self.no_index = SortedIndex()
+        self.version = 0
+        self._next_tseq = 1
+
+    def __len__(self):
+        return len(self.no)
+
+    def load(self, rows):
+        # 목록 응답 형식(trade 항목 dict)의 행을 추가
+        start = len(self)
+        try:
+            for row in rows:
+                self._append(row["bid"], row["no"], row["sid"], row["cid"], row.get("tbid", ""),
+                             row["tsdt"], row.get("tedt"), row.get("btid"), row.get("pow"), row.get("mon"),
+                             row.get("bprice", ""), row.get("tbprice", ""), row.get("bmon"),
+                             row.get("regdate"), row.get("tseq"))
+        finally:
+            # 중간에 실패해도 그때까지 추가된 행은 색인한다
+            self._index(start)
+            self.version += 1
+
+    def insert(self, bid, items, regdate):
+        # 등록 요청(Trade 모델) 항목을 추가. tseq는 순번으로 발급한다.
+        start = len(self)
+        try:
+            for item in items:
+                self._append(bid, item.no, item.sid, item.cid, item.tbid, item.tsdt, item.tedt, item.btid,
+                             item.pow, item.mon, _price(item.bprice), _price(item.tbprice), item.bmon,
+                             regdate, None)
+        finally:
+            self._index(start)
+            self.version += 1
+
+    def _index(self, start):
+        # 새 행이 기존보다 많으면(초기 적재 등) 다시 정렬하고, 적으면 배치를 정렬해 병합한다
+        count = len(self) - start
+        if count > start:
+            self.tsdt_index.rebuild(self.tsdt)
+            self.no_index.rebuild(self.no)
+            return
+        rows = range(start, len(self))
+        self.tsdt_index.merge([(self.tsdt[i], i) for i in rows])
+        self.no_index.merge([(self.no[i], i) for i in rows])
+
+    def query(self, sdate=None, edate=None, no=None):
+        # tsdt가 sdate~edate(포함) 범위이고 카드번호가 no인 행 번호를 tsdt 순으로 반환
+        low = _int(sdate) if sdate else None
+        high = _int(edate) if edate else None
+        if no is None:
+            return self.tsdt_index.range(low, high)
+        rows = [
+            i for i in self.no_index.range(int(no), int(no))
+            if (low is None or self.tsdt[i] >= low) and (high is None or self.tsdt[i] <= high)
+        ]
+        rows.sort(key=self.tsdt.__getitem__)
+        return rows
+
+    def _append(self, bid, no, sid, cid, tbid, tsdt, tedt, btid, pow, mon, bprice, tbprice, bmon, regdate, tseq):
+        # 모든 값을 먼저 변환/검사한 뒤에 추가한다. 변환 중 오류가 나면 어떤 컬럼도 바뀌지 않아
+        # 컬럼 길이가 어긋나지 않는다.
+        tseq = self._next_tseq if tseq is None or tseq == "" else _int(tseq)
+        ints = (_int(no), _int(tsdt), _int(tedt), _int(pow), _int(mon), _int(bmon), _int(regdate))
+        codes = (self.bid.code(bid), self.sid.code(sid), self.cid.code(cid), self.tbid.code(tbid),
+                 self.bprice.code(bprice), self.tbprice.code(tbprice))
+        self._next_tseq = max(self._next_tseq, tseq + 1)
+
+        no, tsdt, tedt, pow, mon, bmon, regdate = ints
+        self.bid.codes.append(codes[0])
+        self.no.append(no)
+        self.sid.codes.append(codes[1])
+        self.cid.codes.append(codes[2])
+        self.tbid.codes.append(codes[3])
+        self.tsdt.append(tsdt)
+        self.tedt.append(tedt)
+        self.btid.append(btid or "")
+        self.pow.append(pow)
+        self.mon.append(mon)
+        self.bprice.codes.append(codes[4])
+        self.tbprice.codes.append(codes[5])
+        self.bmon.append(bmon)
+        self.regdate.append(regdate)
+        self.tseq.append(tseq)
+
+    def row(self, i):
+        # 목록 응답 형식으로 복원 (pow는 숫자, 나머지는 문자열)
+        return {
+            "bid": self.bid[i],
+            "no": f"{self.no[i]:016d}",
+            "sid": self.sid[i],
+            "cid": self.cid[i],
+            "tbid": self.tbid[i],
+            "tsdt": _ts(self.tsdt[i]),
+            "tedt": _ts(self.tedt[i]),
+            "btid": self.btid[i],
+            "pow": None if self.pow[i] == MISSING else self.pow[i],
+            "mon": _str(self.mon[i]),
+            "bprice": self.bprice[i],
+            "tbprice": self.tbprice[i],
+            "bmon": _str(self.bmon[i]),
+            "regdate": _ts(self.regdate[i]),
+            "tseq": str(self.tseq[i]),
+        }
+
+    def iter_rows(self, start=0, stop=None):
+        stop = len(self) if stop is None else min(stop, len(self))
+        for i in range(start, stop):
+            yield self.row(i)
+
+    def select(self, rows):
+        return TradeRows(self, rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(len(self)))]
+        return self.row(index)
+
+
+class TradeRows:
+    # query() 결과(행 번호 목록)를 PagedDataset/스트리밍에서 목록처럼 쓰기 위한 뷰
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for i in self.rows:
+            yield self.store.row(i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.row(i) for i in self.rows[index]]
+        return self.store.row(self.rows[index])
@@ -0,0 +1,118 @@
+# write_behind.py
+import asyncio
+import json
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    # 요청에서 저장소 기록을 기다리지 않도록, 기록할 (저장 함수, 행 목록)을 제한된 asyncio 큐에 넣고
+    # 백그라운드 태스크가 max_rows 건 또는 interval 초 단위로 모아 한 트랜잭션으로 기록한다.
+    # 큐가 가득 차면 full()이 True가 되어 핸들러는 재시도 가능한 오류(503)로 응답한다.
+    # 기록이 실패하면 retries 번까지 간격을 두 배씩 늘려 다시 시도하고(그동안 큐가 차서 요청이 503을 받는다),
+    # 그래도 실패한 배치는 spill_file에 남기고 failed_batches/failed_rows로 집계한다.
+    def __init__(self, storage, maxsize=1000, max_rows=20000, interval=0.2, retries=5, spill_file=None):
+        self.storage = storage
+        self.maxsize = maxsize
+        self.max_rows = max_rows
+        self.interval = interval
+        self.retries = retries
+        self.spill_file = spill_file
+        self.failed_batches = 0
+        self.failed_rows = 0
+        self._queue = None
+        self._task = None
+
+    def pending(self):
+        # 기록 대기 중인 요청 수
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self):
+        # 큐는 실행 중인 이벤트 루프 안에서 만든다
+        self._queue = asyncio.Queue(self.maxsize)
+        self._task = asyncio.create_task(self._run())
+
+    def full(self):
+        return self._queue.full()
+
+    async def wait_for_space(self):
+        # 스트리밍 대량 등록처럼 기다릴 수 있는 요청은 오류 대신 자리가 날 때까지 대기
+        while self._queue.full():
+            await asyncio.sleep(self.interval)
+
+    def put(self, save, rows):
+        rows = list(rows)
+        if rows:
+            self._queue.put_nowait((save, rows))
+
+    async def drain(self):
+        # 종료 시 남은 기록을 모두 쓰고 태스크를 끝낸다
+        if self._task is None:
+            return
+        await self._queue.put((None, None))
+        await self._task
+        self._task = None
+        if self.failed_batches:
+            logger.error(f"Write-behind failures: {self.failed_batches} batches, {self.failed_rows} rows")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            save, rows = await self._queue.get()
+            if save is None:
+                break
+            batch = [(save, rows)]
+            count = len(rows)
+            deadline = loop.time() + self.interval
+            while count < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    save, rows = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if save is None:
+                    stopping = True
+                    break
+                batch.append((save, rows))
+                count += len(rows)
+            await self._write(batch, count)
+
+    async def _write(self, batch, count):
+        delay = self.interval
+        for attempt in range(self.retries + 1):
+            try:
+                await run_in_threadpool(self._flush, batch)
+                return
+            except Exception as e:
+                logger.error(f"Write-behind flush error ({count} rows, attempt {attempt + 1}): {str(e)}")
+            if attempt < self.retries:
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        self.failed_batches += 1
+        self.failed_rows += count
+        if self.spill_file:
+            try:
+                await run_in_threadpool(self._spill, batch)
+                logger.error(f"Write-behind batch spilled to {self.spill_file} ({count} rows)")
+                return
+            except Exception as e:
+                logger.error(f"Write-behind spill error: {str(e)}")
+        logger.error(f"Write-behind batch dropped ({count} rows, {self.failed_rows} rows lost so far)")
+
+    def _flush(self, batch):
+        with self.storage.transaction():
+            for save, rows in batch:
+                save(rows)
+
+    def _spill(self, batch):
+        # 한 줄에 {"save": 저장 함수 이름, "rows": [...]} (나중에 같은 save_* 로 다시 기록할 수 있게)
+        with open(self.spill_file, "a", encoding="utf-8") as f:
+            for save, rows in batch:
+                f.write(json.dumps({"save": save.__name__, "rows": rows}, ensure_ascii=False) + "\n")